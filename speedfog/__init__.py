@@ -1,25 +1,67 @@
 """SpeedFog core - DAG generator for Elden Ring zone randomization."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 
-from speedfog.clusters import ClusterData, ClusterPool, load_clusters
-from speedfog.config import (
-    Config,
-    PathsConfig,
-    RequirementsConfig,
-    StructureConfig,
-    load_config,
-)
-from speedfog.dag import Dag, DagEdge, DagNode
-from speedfog.generator import (
-    GenerationError,
-    GenerationResult,
-    generate_dag,
-    generate_with_retry,
-)
-from speedfog.planner import compute_tier, plan_layer_types
-from speedfog.spoiler import export_spoiler_log
-from speedfog.validator import ValidationResult, validate_dag
+if TYPE_CHECKING:
+    from speedfog.clusters import ClusterData, ClusterPool, load_clusters
+    from speedfog.config import (
+        Config,
+        PathsConfig,
+        RequirementsConfig,
+        StructureConfig,
+        load_config,
+    )
+    from speedfog.dag import Dag, DagEdge, DagNode
+    from speedfog.generator import (
+        GenerationError,
+        GenerationResult,
+        generate_dag,
+        generate_with_retry,
+    )
+    from speedfog.planner import compute_tier, plan_layer_types
+    from speedfog.spoiler import export_spoiler_log
+    from speedfog.validator import ValidationResult, validate_dag
+
+# Public name -> defining module. The modules are imported on first access
+# (PEP 562), so importing a single submodule, as the tests and tools do,
+# does not pull in the spoiler/graph export side of the package.
+_LAZY_EXPORTS = {
+    "ClusterData": "speedfog.clusters",
+    "ClusterPool": "speedfog.clusters",
+    "load_clusters": "speedfog.clusters",
+    "Config": "speedfog.config",
+    "PathsConfig": "speedfog.config",
+    "RequirementsConfig": "speedfog.config",
+    "StructureConfig": "speedfog.config",
+    "load_config": "speedfog.config",
+    "Dag": "speedfog.dag",
+    "DagEdge": "speedfog.dag",
+    "DagNode": "speedfog.dag",
+    "GenerationError": "speedfog.generator",
+    "GenerationResult": "speedfog.generator",
+    "generate_dag": "speedfog.generator",
+    "generate_with_retry": "speedfog.generator",
+    "compute_tier": "speedfog.planner",
+    "plan_layer_types": "speedfog.planner",
+    "export_spoiler_log": "speedfog.spoiler",
+    "ValidationResult": "speedfog.validator",
+    "validate_dag": "speedfog.validator",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Config
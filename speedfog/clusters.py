@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_qualified_fog_id(qualified: str) -> tuple[str | None, str]:
-    """Parse 'zone:fog_id' or plain 'fog_id'. Returns (zone_or_none, fog_id)."""
+    """Parse 'zone:fog_id' or plain 'fog_id'. Returns (zone_or_none, fog_id).
+
+    Cached, with interned parts: proximity specs are matched against fogs
+    on every capacity check, and interned parts compare with the interned
+    cluster fog strings by pointer.
+    """
     if ":" in qualified:
         zone, fog_id = qualified.split(":", 1)
-        return zone, fog_id
+        return sys.intern(zone), sys.intern(fog_id)
     return None, qualified
 
 
@@ -43,7 +51,20 @@ def _filter_fogs_by_allowed(fogs: list[dict], allowed: list[str]) -> list[dict]:
     ]
 
 
-@dataclass
+def _intern_fogs(fogs: list[dict]) -> list[dict]:
+    """Copy fog dicts with interned fog_id/zone strings.
+
+    Every FogRef built during generation reuses these strings, so interning
+    them once at load time makes the many equality checks on fog/zone pairs
+    (edge keys, consumed-entry sets) mostly pointer comparisons.
+    """
+    return [
+        {**f, "fog_id": sys.intern(f["fog_id"]), "zone": sys.intern(f["zone"])}
+        for f in fogs
+    ]
+
+
+@dataclass(slots=True)
 class ClusterData:
     """A cluster loaded from clusters.json."""
 
@@ -51,8 +72,8 @@ class ClusterData:
     zones: list[str]
     type: str  # start, final_boss, legacy_dungeon, mini_dungeon, boss_arena
     weight: float
-    entry_fogs: list[dict]  # [{"fog_id": str, "zone": str}, ...]
-    exit_fogs: list[dict]  # [{"fog_id": str, "zone": str, "unique"?: bool}, ...]
+    entry_fogs: tuple[dict, ...]  # ({"fog_id": str, "zone": str}, ...)
+    exit_fogs: tuple[dict, ...]  # ({"fog_id": str, "zone": str, "unique"?: bool}, ...)
     unique_exit_fogs: list[dict] = field(
         default_factory=list
     )  # unique exits (filtered out)
@@ -60,17 +81,67 @@ class ClusterData:
     allow_entry_as_exit: bool = (
         False  # Entry fog's return direction used as forward exit
     )
-    proximity_groups: list[list[str]] = field(
-        default_factory=list
-    )  # Fogs spatially close — entry and exit cannot share a group
+    # Fogs spatially close — entry and exit cannot share a group
+    proximity_groups: tuple[tuple[str, ...], ...] = ()
     display_name: str = ""  # Pre-computed display name from clusters.json
     boss_name: str = ""  # Canonical boss name from enemy.txt (via clusters.json)
+    # (fog_id, zone) keys parallel to entry_fogs/exit_fogs, so hot checks
+    # compare tuples instead of indexing each fog dict twice.
+    entry_fog_keys: tuple[tuple[str, str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    exit_fog_keys: tuple[tuple[str, str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    # Sets of entry/exit_fog_keys, for O(1) bidirectional-gate checks
+    entry_keys: frozenset[tuple[str, str]] = field(
+        init=False, repr=False, compare=False
+    )
+    exit_keys: frozenset[tuple[str, str]] = field(init=False, repr=False, compare=False)
+    # entry_fog_keys that are also exits (same side of a bidirectional gate)
+    bidirectional_keys: tuple[tuple[str, str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    # Whether any entry is tagged "main" (FogMod's main entrance)
+    has_main_entry: bool = field(init=False, repr=False, compare=False)
+    # Frozen copy of zones for C-level overlap checks (isdisjoint)
+    zone_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    # Memoized count_net_exits(self, 1), filled lazily by the generator
+    single_entry_net_exits: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Proximity-group specs blocked by each (fog_id, zone) entry, filled
+    # lazily by the generator
+    proximity_blocked: dict[tuple[str, str], frozenset[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Store fog lists as tuples: they are read-only after loading."""
+        self.entry_fogs = tuple(self.entry_fogs)
+        self.exit_fogs = tuple(self.exit_fogs)
+        # Read-only after loading, like the fog tuples
+        self.proximity_groups = tuple(tuple(g) for g in self.proximity_groups)
+        self.zone_set = frozenset(self.zones)
+        self.refresh_fog_keys()
+
+    def refresh_fog_keys(self) -> None:
+        """Recompute the fog key fields after entry_fogs/exit_fogs changed."""
+        self.entry_fog_keys = tuple((f["fog_id"], f["zone"]) for f in self.entry_fogs)
+        self.exit_fog_keys = tuple((f["fog_id"], f["zone"]) for f in self.exit_fogs)
+        self.entry_keys = frozenset(self.entry_fog_keys)
+        self.exit_keys = frozenset(self.exit_fog_keys)
+        self.bidirectional_keys = tuple(
+            key for key in self.entry_fog_keys if key in self.exit_keys
+        )
+        self.has_main_entry = any(f.get("main") for f in self.entry_fogs)
+        self.single_entry_net_exits = None
 
     @classmethod
     def from_dict(cls, data: dict) -> ClusterData:
         """Create ClusterData from a dictionary."""
-        all_exits = data.get("exit_fogs", [])
-        entry_fogs = data.get("entry_fogs", [])
+        all_exits = _intern_fogs(data.get("exit_fogs", []))
+        entry_fogs = _intern_fogs(data.get("entry_fogs", []))
         exit_fogs = [f for f in all_exits if not f.get("unique")]
 
         # Filter by allowed_entries/allowed_exits at load time so all
@@ -84,15 +155,18 @@ class ClusterData:
 
         return cls(
             id=data["id"],
-            zones=data["zones"],
+            zones=[sys.intern(z) for z in data["zones"]],
             type=data["type"],
             weight=float(data["weight"]),
-            entry_fogs=entry_fogs,
-            exit_fogs=exit_fogs,
+            entry_fogs=tuple(entry_fogs),
+            exit_fogs=tuple(exit_fogs),
             unique_exit_fogs=[f for f in all_exits if f.get("unique")],
             defeat_flag=data.get("defeat_flag", 0),
             allow_entry_as_exit=data.get("allow_entry_as_exit", False),
-            proximity_groups=data.get("proximity_groups", []),
+            proximity_groups=tuple(
+                tuple(sys.intern(spec) for spec in g)
+                for g in data.get("proximity_groups", [])
+            ),
             display_name=data.get("display_name", ""),
             boss_name=data.get("boss_name", ""),
         )
@@ -195,17 +269,14 @@ class ClusterPool:
         # Weight is intentionally NOT updated: roundtable is a hub accessible
         # via menu teleport, not a dungeon the player must traverse sequentially.
         start.zones.extend(roundtable.zones)
-        start.entry_fogs.extend(roundtable.entry_fogs)
-        start.exit_fogs.extend(roundtable.exit_fogs)
+        start.zone_set = frozenset(start.zones)
+        start.entry_fogs += roundtable.entry_fogs
+        start.exit_fogs += roundtable.exit_fogs
         start.unique_exit_fogs.extend(roundtable.unique_exit_fogs)
+        start.refresh_fog_keys()
 
         # Remove roundtable from the pool
-        self.clusters.remove(roundtable)
-        del self.by_id[roundtable.id]
-        if roundtable.type in self.by_type:
-            type_list = self.by_type[roundtable.type]
-            if roundtable in type_list:
-                type_list.remove(roundtable)
+        self._remove_clusters([roundtable])
 
     def filter_passant_incompatible(self) -> list[ClusterData]:
         """Remove clusters that can never serve as passant nodes.
@@ -228,15 +299,7 @@ class ClusterPool:
             for c in self.clusters
             if c.type not in exempt_types and not can_be_passant_node(c)
         ]
-
-        for cluster in to_remove:
-            self.clusters.remove(cluster)
-            del self.by_id[cluster.id]
-            if cluster.type in self.by_type:
-                type_list = self.by_type[cluster.type]
-                if cluster in type_list:
-                    type_list.remove(cluster)
-
+        self._remove_clusters(to_remove)
         return to_remove
 
     def exclude_zones(self, zones: list[str]) -> list[ClusterData]:
@@ -257,13 +320,23 @@ class ClusterPool:
         if not excluded:
             return []
         to_remove = [c for c in self.clusters if excluded.intersection(c.zones)]
+        self._remove_clusters(to_remove)
+        return to_remove
+
+    def _remove_clusters(self, to_remove: list[ClusterData]) -> None:
+        """Drop clusters from clusters / by_type / by_id in one pass.
+
+        Matches by identity: list.remove() would compare each candidate
+        field by field (fog tuples included) for every removed cluster.
+        """
+        if not to_remove:
+            return
+        removed = {id(c) for c in to_remove}
+        self.clusters[:] = [c for c in self.clusters if id(c) not in removed]
         for cluster in to_remove:
-            self.clusters.remove(cluster)
             del self.by_id[cluster.id]
-            type_list = self.by_type.get(cluster.type)
-            if type_list and cluster in type_list:
-                type_list.remove(cluster)
-        return to_remove
+        for type_list in self.by_type.values():
+            type_list[:] = [c for c in type_list if id(c) not in removed]
 
     @classmethod
     def from_json(cls, path: Path) -> ClusterPool:
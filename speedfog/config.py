@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import copy
+import dataclasses
+import functools
+import os
 import random
 import tomllib
 import warnings
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, TypeVar
 
 from speedfog.constants import (
     DEFAULT_MAX_LAYER_SPREAD,
@@ -25,6 +31,32 @@ _CLUSTER_TYPE_TO_FIELD = {
 }
 
 
+def _check_ranges(
+    obj: object,
+    ranges: tuple[tuple[str, int, int], ...],
+    *,
+    require_int: bool = False,
+) -> None:
+    """Validate integer fields against inclusive (name, min, max) bounds.
+
+    Every out-of-range field is reported in a single ValueError (messages
+    joined with "; ", in table order). With ``require_int``, the first non-int
+    value stops the scan since it cannot be range-checked: range errors found
+    before it are raised as the ValueError, otherwise it raises TypeError.
+    """
+    errors: list[str] = []
+    for name, lo, hi in ranges:
+        value = getattr(obj, name)
+        if require_int and not isinstance(value, int):
+            if errors:
+                break
+            raise TypeError(f"{name} must be int, got {type(value).__name__}")
+        if value < lo or value > hi:
+            errors.append(f"{name} must be {lo}-{hi}, got {value}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
 @dataclass
 class RequirementsConfig:
     """Zone requirements configuration."""
@@ -99,6 +131,11 @@ class StructureConfig:
     )
     layers_count: int = 30  # Total layers (start + intermediates + final boss)
 
+    _TIER_RANGES = (
+        ("start_tier", 1, MAX_TIER),
+        ("final_tier", 1, MAX_TIER),
+    )
+
     def __post_init__(self) -> None:
         """Validate structure configuration."""
         if self.max_parallel_paths < 1:
@@ -120,18 +157,7 @@ class StructureConfig:
                 f"max_parallel_paths must be >= 2 when max_entrances >= 2, "
                 f"got max_parallel_paths={self.max_parallel_paths}"
             )
-        if not isinstance(self.start_tier, int):
-            raise TypeError(
-                f"start_tier must be int, got {type(self.start_tier).__name__}"
-            )
-        if self.start_tier < 1 or self.start_tier > MAX_TIER:
-            raise ValueError(f"start_tier must be 1-{MAX_TIER}, got {self.start_tier}")
-        if not isinstance(self.final_tier, int):
-            raise TypeError(
-                f"final_tier must be int, got {type(self.final_tier).__name__}"
-            )
-        if self.final_tier < 1 or self.final_tier > MAX_TIER:
-            raise ValueError(f"final_tier must be 1-{MAX_TIER}, got {self.final_tier}")
+        _check_ranges(self, self._TIER_RANGES, require_int=True)
         if self.start_tier > self.final_tier:
             raise ValueError(
                 f"start_tier ({self.start_tier}) must be <= final_tier ({self.final_tier})"
@@ -169,6 +195,12 @@ class StructureConfig:
         }
 
 
+@functools.lru_cache(maxsize=8)
+def _sorted_zones(zones: frozenset[str]) -> tuple[str, ...]:
+    """Sorted zone names, memoized: the boss zone set is fixed per pool."""
+    return tuple(sorted(zones))
+
+
 def resolve_final_boss_candidates(
     candidates: dict[str, int], all_boss_zones: set[str]
 ) -> dict[str, int]:
@@ -182,7 +214,7 @@ def resolve_final_boss_candidates(
         Dict of zone name -> weight with 'all' expanded to actual zones (weight 1).
     """
     if "all" in candidates:
-        return dict.fromkeys(sorted(all_boss_zones), 1)
+        return dict.fromkeys(_sorted_zones(frozenset(all_boss_zones)), 1)
     return candidates
 
 
@@ -218,6 +250,47 @@ class PathsConfig:
     platform: str | None = None  # None = auto-detect, "windows", "linux"
 
 
+# Starting item flag -> Good ID, in award order. Good IDs are from fog.txt
+# KeyItems section (format: 3:XXXX where 3=Goods).
+_KEY_ITEM_GOODS = (
+    ("academy_key", 8109),  # Academy Glintstone Key
+    ("pureblood_medal", 2160),  # Pureblood Knight's Medal
+    ("rusty_key", 8010),  # Rusty Key (Stormveil Castle gate)
+    ("drawing_room_key", 8134),  # Drawing-Room Key (Volcano Manor)
+    ("lantern", 2070),  # Lantern
+    ("spirit_calling_bell", 8158),  # Spirit Calling Bell
+    ("physick_flask", 250),  # Flask of Wondrous Physick
+    ("whetstone_knife", 8590),  # Whetstone Knife
+)
+_WHETBLADE_GOODS = (
+    8970,  # Iron Whetblade (Heavy, Keen, Quality)
+    8971,  # Red-Hot Whetblade (Fire, Flame Art)
+    8972,  # Sanctified Whetblade (Lightning, Sacred)
+    8973,  # Glintstone Whetblade (Magic, Cold)
+    8974,  # Black Whetblade (Poison, Blood, Occult)
+)
+_DLC_KEY_ITEM_GOODS = (
+    ("omother", 2009004),  # O, Mother
+    ("welldepthskey", 2008004),  # Well Depths Key
+    ("gaolupperlevelkey", 2008005),  # Gaol Upper Level Key
+    ("gaollowerlevelkey", 2008006),  # Gaol Lower Level Key
+    ("holeladennecklace", 2008008),  # Hole-Laden Necklace
+    ("messmerskindling", 2008021),  # Messmer's Kindling
+)
+_TALISMAN_POUCH_GOOD = 10040
+# Great Runes (RESTORED versions - Good IDs 191-196). These are the
+# activated/restored versions, equippable at Graces, NOT the boss drop
+# versions (8148-8153) which need Divine Tower activation.
+_GREAT_RUNE_GOODS = (
+    ("rune_godrick", 191),  # Godrick's Great Rune (restored)
+    ("rune_radahn", 192),  # Radahn's Great Rune (restored)
+    ("rune_morgott", 193),  # Morgott's Great Rune (restored)
+    ("rune_rykard", 194),  # Rykard's Great Rune (restored)
+    ("rune_mohg", 195),  # Mohg's Great Rune (restored)
+    ("rune_malenia", 196),  # Malenia's Great Rune (restored)
+)
+
+
 @dataclass
 class StartingItemsConfig:
     """Starting items given when picking up the Tarnished's Wizened Finger.
@@ -274,26 +347,18 @@ class StartingItemsConfig:
     larval_tears: int = 10  # Larval Tears (Good ID 8185) - for rebirth at graces
     stonesword_keys: int = 6  # Stonesword Keys (Good ID 8000) - unlock imp statue seals
 
+    _RANGES = (
+        ("talisman_pouches", 0, 3),
+        ("golden_seeds", 0, 99),
+        ("sacred_tears", 0, 12),
+        ("starting_runes", 0, 10_000_000),
+        ("larval_tears", 0, 99),
+        ("stonesword_keys", 0, 99),
+    )
+
     def __post_init__(self) -> None:
         """Validate starting items configuration."""
-        if self.talisman_pouches < 0 or self.talisman_pouches > 3:
-            raise ValueError(
-                f"talisman_pouches must be 0-3, got {self.talisman_pouches}"
-            )
-        if self.golden_seeds < 0 or self.golden_seeds > 99:
-            raise ValueError(f"golden_seeds must be 0-99, got {self.golden_seeds}")
-        if self.sacred_tears < 0 or self.sacred_tears > 12:
-            raise ValueError(f"sacred_tears must be 0-12, got {self.sacred_tears}")
-        if self.starting_runes < 0 or self.starting_runes > 10_000_000:
-            raise ValueError(
-                f"starting_runes must be 0-10000000, got {self.starting_runes}"
-            )
-        if self.larval_tears < 0 or self.larval_tears > 99:
-            raise ValueError(f"larval_tears must be 0-99, got {self.larval_tears}")
-        if self.stonesword_keys < 0 or self.stonesword_keys > 99:
-            raise ValueError(
-                f"stonesword_keys must be 0-99, got {self.stonesword_keys}"
-            )
+        _check_ranges(self, self._RANGES)
 
     def get_starting_goods(self) -> list[int]:
         """Get list of Good IDs to award at game start.
@@ -301,81 +366,18 @@ class StartingItemsConfig:
         Uses DirectlyGivePlayerItem which is not affected by Item Randomizer.
         Good IDs are from fog.txt KeyItems section (format: 3:XXXX where 3=Goods).
         """
-        goods: list[int] = []
-
-        # Key items for progression shortcuts
-        if self.academy_key:
-            goods.append(8109)  # Academy Glintstone Key
-        if self.pureblood_medal:
-            goods.append(2160)  # Pureblood Knight's Medal
-        if self.rusty_key:
-            goods.append(8010)  # Rusty Key (Stormveil Castle gate)
-        if self.drawing_room_key:
-            goods.append(8134)  # Drawing-Room Key (Volcano Manor)
-        if self.lantern:
-            goods.append(2070)  # Lantern
-        if self.spirit_calling_bell:
-            goods.append(8158)  # Spirit Calling Bell
-        if self.physick_flask:
-            goods.append(250)  # Flask of Wondrous Physick
-        if self.whetstone_knife:
-            goods.append(8590)  # Whetstone Knife
+        goods = [gid for name, gid in _KEY_ITEM_GOODS if getattr(self, name)]
         if self.whetblades:
-            goods.extend(
-                [
-                    8970,  # Iron Whetblade (Heavy, Keen, Quality)
-                    8971,  # Red-Hot Whetblade (Fire, Flame Art)
-                    8972,  # Sanctified Whetblade (Lightning, Sacred)
-                    8973,  # Glintstone Whetblade (Magic, Cold)
-                    8974,  # Black Whetblade (Poison, Blood, Occult)
-                ]
-            )
-
-        # DLC key items
-        if self.omother:
-            goods.append(2009004)  # O, Mother
-        if self.welldepthskey:
-            goods.append(2008004)  # Well Depths Key
-        if self.gaolupperlevelkey:
-            goods.append(2008005)  # Gaol Upper Level Key
-        if self.gaollowerlevelkey:
-            goods.append(2008006)  # Gaol Lower Level Key
-        if self.holeladennecklace:
-            goods.append(2008008)  # Hole-Laden Necklace
-        if self.messmerskindling:
-            goods.append(2008021)  # Messmer's Kindling
+            goods.extend(_WHETBLADE_GOODS)
+        goods.extend(gid for name, gid in _DLC_KEY_ITEM_GOODS if getattr(self, name))
 
         # Talisman Pouches (+1 equip slot each, max 3)
-        for _ in range(self.talisman_pouches):
-            goods.append(10040)  # Talisman Pouch
+        goods.extend([_TALISMAN_POUCH_GOOD] * self.talisman_pouches)
 
-        # Great Runes (RESTORED versions - Good IDs 191-196)
-        # These are the activated/restored versions, equippable at Graces
-        # NOT the boss drop versions (8148-8153) which need Divine Tower activation
         if self.great_runes:
-            goods.extend(
-                [
-                    191,  # Godrick's Great Rune (restored)
-                    192,  # Radahn's Great Rune (restored)
-                    193,  # Morgott's Great Rune (restored)
-                    194,  # Rykard's Great Rune (restored)
-                    195,  # Mohg's Great Rune (restored)
-                    196,  # Malenia's Great Rune (restored)
-                ]
-            )
+            goods.extend(gid for _, gid in _GREAT_RUNE_GOODS)
         else:
-            if self.rune_godrick:
-                goods.append(191)
-            if self.rune_radahn:
-                goods.append(192)
-            if self.rune_morgott:
-                goods.append(193)
-            if self.rune_rykard:
-                goods.append(194)
-            if self.rune_mohg:
-                goods.append(195)
-            if self.rune_malenia:
-                goods.append(196)
+            goods.extend(gid for name, gid in _GREAT_RUNE_GOODS if getattr(self, name))
 
         return goods
 
@@ -402,10 +404,11 @@ class ItemRandomizerConfig:
     item_preset: bool = True  # Enable item placement preset
     item_preset_path: str = ""  # Custom preset path (empty = built-in default)
 
+    _RANGES = (("difficulty", 0, 100),)
+
     def __post_init__(self) -> None:
         """Validate configuration."""
-        if self.difficulty < 0 or self.difficulty > 100:
-            raise ValueError(f"difficulty must be 0-100, got {self.difficulty}")
+        _check_ranges(self, self._RANGES)
 
 
 @dataclass
@@ -476,10 +479,11 @@ class CarePackageConfig:
     crystal_tears: int = 5
     ashes_of_war: int = 0
 
+    _RANGES = (("weapon_upgrade", 0, 25),)
+
     def __post_init__(self) -> None:
         """Validate care package configuration."""
-        if self.weapon_upgrade < 0 or self.weapon_upgrade > 25:
-            raise ValueError(f"weapon_upgrade must be 0-25, got {self.weapon_upgrade}")
+        _check_ranges(self, self._RANGES)
         count_fields = [
             "weapons",
             "shields",
@@ -500,10 +504,57 @@ class CarePackageConfig:
                 raise ValueError(f"{field_name} must be >= 0, got {value}")
 
 
+# Legacy [structure] keys: accepted with a DeprecationWarning in from_dict.
+_LEGACY_STRUCTURE_KEYS = (
+    "split_probability",
+    "merge_probability",
+    "max_branches",
+    "min_layers",
+    "max_layers",
+    "min_branch_age",
+    "crosslinks",
+)
+
+
+@functools.cache
+def _field_names(cls: type) -> frozenset[str]:
+    """Return the dataclass field names of cls (computed once per class)."""
+    return frozenset(f.name for f in dataclasses.fields(cls))
+
+
+_T = TypeVar("_T")
+
+
+def _build_section(cls: type[_T], section: dict[str, Any], **converted: Any) -> _T:
+    """Instantiate a sub-config dataclass from its TOML section.
+
+    from_dict has already rejected unknown keys and dropped legacy ones, so
+    the section is passed straight through as keyword arguments; keys absent
+    from it fall back to the dataclass defaults, so the defaults live in one
+    place. ``converted`` overrides raw section values that need normalizing
+    first.
+    """
+    return cls(**{**section, **converted})
+
+
+def _convert_structure_values(section: dict[str, Any]) -> dict[str, Any]:
+    """Normalize [structure] values whose TOML form differs from the field type."""
+    converted: dict[str, Any] = {}
+    if "final_boss_candidates" in section:
+        converted["final_boss_candidates"] = _parse_final_boss_candidates(
+            section["final_boss_candidates"]
+        )
+    for key in ("max_weight_tolerance", "max_layer_spread"):
+        if key in section:
+            converted[key] = float(section[key])
+    return converted
+
+
 # Known config sections and their accepted keys. None means the section's
-# content is free-form (validated elsewhere). Keep in sync with from_dict;
-# _reject_unknown_keys uses this to fail loudly on typos instead of letting
-# them be silent no-ops.
+# content is free-form (validated elsewhere). Sub-config sections accept
+# exactly their dataclass fields; [run] maps onto top-level Config fields
+# and is listed explicitly. _reject_unknown_keys uses this to fail loudly
+# on typos instead of letting them be silent no-ops.
 _KNOWN_SECTION_KEYS: dict[str, frozenset[str] | None] = {
     "run": frozenset(
         {
@@ -514,118 +565,13 @@ _KNOWN_SECTION_KEYS: dict[str, frozenset[str] | None] = {
             "death_markers",
         }
     ),
-    "requirements": frozenset(
-        {
-            "legacy_dungeons",
-            "bosses",
-            "mini_dungeons",
-            "major_bosses",
-            "zones",
-            "exclude_zones",
-            "allowed_types",
-        }
-    ),
-    "structure": frozenset(
-        {
-            "max_parallel_paths",
-            "max_exits",
-            "max_entrances",
-            "first_layer_type",
-            "final_boss_candidates",
-            "start_tier",
-            "final_tier",
-            "tier_curve",
-            "tier_curve_exponent",
-            "max_weight_tolerance",
-            "max_layer_spread",
-            "layers_count",
-            # Legacy keys: accepted with a DeprecationWarning in from_dict
-            "split_probability",
-            "merge_probability",
-            "max_branches",
-            "min_layers",
-            "max_layers",
-            "min_branch_age",
-            "crosslinks",
-        }
-    ),
-    "paths": frozenset({"game_dir", "output_dir", "platform"}),
-    "starting_items": frozenset(
-        {
-            "academy_key",
-            "pureblood_medal",
-            "rusty_key",
-            "drawing_room_key",
-            "lantern",
-            "spirit_calling_bell",
-            "physick_flask",
-            "whetstone_knife",
-            "whetblades",
-            "great_runes",
-            "rune_godrick",
-            "rune_radahn",
-            "rune_morgott",
-            "rune_mohg",
-            "rune_rykard",
-            "rune_malenia",
-            "omother",
-            "welldepthskey",
-            "gaolupperlevelkey",
-            "gaollowerlevelkey",
-            "holeladennecklace",
-            "messmerskindling",
-            "talisman_pouches",
-            "golden_seeds",
-            "sacred_tears",
-            "starting_runes",
-            "larval_tears",
-            "stonesword_keys",
-        }
-    ),
-    "item_randomizer": frozenset(
-        {
-            "enabled",
-            "difficulty",
-            "remove_requirements",
-            "auto_upgrade_weapons",
-            "auto_upgrade_dropped",
-            "reduce_upgrade_cost",
-            "auto_equip",
-            "dlc",
-            "nerf_gargoyles",
-            "nerf_malenia",
-            "allcraft",
-            "item_preset",
-            "item_preset_path",
-        }
-    ),
-    "care_package": frozenset(
-        {
-            "enabled",
-            "weapon_upgrade",
-            "weapons",
-            "shields",
-            "catalysts",
-            "talismans",
-            "sorceries",
-            "incantations",
-            "head_armor",
-            "body_armor",
-            "arm_armor",
-            "leg_armor",
-            "crystal_tears",
-            "ashes_of_war",
-        }
-    ),
-    "enemy": frozenset(
-        {
-            "randomize_bosses",
-            "ignore_arena_size",
-            "swap_boss",
-            "dlc_bosses",
-            "bosses",
-        }
-    ),
+    "requirements": _field_names(RequirementsConfig),
+    "structure": _field_names(StructureConfig) | frozenset(_LEGACY_STRUCTURE_KEYS),
+    "paths": _field_names(PathsConfig),
+    "starting_items": _field_names(StartingItemsConfig),
+    "item_randomizer": _field_names(ItemRandomizerConfig),
+    "care_package": _field_names(CarePackageConfig),
+    "enemy": _field_names(EnemyConfig),
     # Free-form plugin tables, envelope-validated in Config.__post_init__
     "plugin": None,
     # Preset metadata consumed by the speedfog-racing platform, not by
@@ -634,6 +580,18 @@ _KNOWN_SECTION_KEYS: dict[str, frozenset[str] | None] = {
 }
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_toml_cached(path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """Parse a TOML file, memoized on (path, mtime_ns, size).
+
+    The stat fields are part of the key so an edited file is re-parsed.
+    The result is shared between callers: it is returned read-only and
+    from_toml deep-copies it before handing it to from_dict.
+    """
+    text = Path(path).read_bytes().decode("utf-8")
+    return MappingProxyType(tomllib.loads(text))
+
+
 def _reject_unknown_keys(data: dict[str, Any]) -> None:
     """Reject unknown sections and unknown keys within known sections.
 
@@ -727,15 +685,7 @@ class Config:
         run_section = data.get("run", {})
         requirements_section = data.get("requirements", {})
         structure_section = data.get("structure", {})
-        for legacy in (
-            "split_probability",
-            "merge_probability",
-            "max_branches",
-            "min_layers",
-            "max_layers",
-            "min_branch_age",
-            "crosslinks",
-        ):
+        for legacy in _LEGACY_STRUCTURE_KEYS:
             if legacy in structure_section:
                 warnings.warn(
                     f"structure.{legacy} is no longer supported and will be ignored; "
@@ -745,11 +695,11 @@ class Config:
                     DeprecationWarning,
                     stacklevel=2,
                 )
-        paths_section = data.get("paths", {})
-        starting_items_section = data.get("starting_items", {})
-        item_randomizer_section = data.get("item_randomizer", {})
-        care_package_section = data.get("care_package", {})
-        enemy_section = data.get("enemy", {})
+        structure_section = {
+            key: value
+            for key, value in structure_section.items()
+            if key not in _LEGACY_STRUCTURE_KEYS
+        }
 
         run_complete_message = run_section.get("run_complete_message", "RUN COMPLETE")
         if isinstance(run_complete_message, list):
@@ -768,131 +718,40 @@ class Config:
             chapel_grace=run_section.get("chapel_grace", True),
             sentry_torch_shop=run_section.get("sentry_torch_shop", True),
             death_markers=run_section.get("death_markers", True),
-            requirements=RequirementsConfig(
-                legacy_dungeons=requirements_section.get("legacy_dungeons", 1),
-                bosses=requirements_section.get("bosses", 5),
-                mini_dungeons=requirements_section.get("mini_dungeons", 5),
-                major_bosses=requirements_section.get("major_bosses", 8),
-                zones=requirements_section.get("zones", []),
-                exclude_zones=requirements_section.get("exclude_zones", []),
-                allowed_types=requirements_section.get(
-                    "allowed_types",
-                    list(_VALID_CLUSTER_TYPES),
-                ),
+            requirements=_build_section(RequirementsConfig, requirements_section),
+            structure=_build_section(
+                StructureConfig,
+                structure_section,
+                **_convert_structure_values(structure_section),
             ),
-            structure=StructureConfig(
-                max_parallel_paths=structure_section.get("max_parallel_paths", 3),
-                max_exits=structure_section.get("max_exits", 3),
-                max_entrances=structure_section.get("max_entrances", 3),
-                first_layer_type=structure_section.get("first_layer_type"),
-                final_boss_candidates=_parse_final_boss_candidates(
-                    structure_section.get("final_boss_candidates", {})
-                ),
-                start_tier=structure_section.get("start_tier", 1),
-                final_tier=structure_section.get("final_tier", MAX_TIER),
-                tier_curve=structure_section.get("tier_curve", "linear"),
-                tier_curve_exponent=structure_section.get("tier_curve_exponent", 0.6),
-                max_weight_tolerance=float(
-                    structure_section.get("max_weight_tolerance", 3.0)
-                ),
-                max_layer_spread=float(
-                    structure_section.get("max_layer_spread", DEFAULT_MAX_LAYER_SPREAD)
-                ),
-                layers_count=structure_section.get("layers_count", 30),
+            paths=_build_section(PathsConfig, data.get("paths", {})),
+            starting_items=_build_section(
+                StartingItemsConfig, data.get("starting_items", {})
             ),
-            paths=PathsConfig(
-                game_dir=paths_section.get("game_dir", ""),
-                output_dir=paths_section.get("output_dir", "./seeds"),
-                platform=paths_section.get("platform"),
+            item_randomizer=_build_section(
+                ItemRandomizerConfig, data.get("item_randomizer", {})
             ),
-            starting_items=StartingItemsConfig(
-                academy_key=starting_items_section.get("academy_key", True),
-                pureblood_medal=starting_items_section.get("pureblood_medal", False),
-                rusty_key=starting_items_section.get("rusty_key", True),
-                drawing_room_key=starting_items_section.get("drawing_room_key", True),
-                lantern=starting_items_section.get("lantern", True),
-                spirit_calling_bell=starting_items_section.get(
-                    "spirit_calling_bell", True
-                ),
-                physick_flask=starting_items_section.get("physick_flask", True),
-                whetstone_knife=starting_items_section.get("whetstone_knife", True),
-                whetblades=starting_items_section.get("whetblades", True),
-                great_runes=starting_items_section.get("great_runes", True),
-                rune_godrick=starting_items_section.get("rune_godrick", True),
-                rune_radahn=starting_items_section.get("rune_radahn", True),
-                rune_morgott=starting_items_section.get("rune_morgott", True),
-                rune_mohg=starting_items_section.get("rune_mohg", True),
-                rune_rykard=starting_items_section.get("rune_rykard", True),
-                rune_malenia=starting_items_section.get("rune_malenia", True),
-                omother=starting_items_section.get("omother", True),
-                welldepthskey=starting_items_section.get("welldepthskey", True),
-                gaolupperlevelkey=starting_items_section.get("gaolupperlevelkey", True),
-                gaollowerlevelkey=starting_items_section.get("gaollowerlevelkey", True),
-                holeladennecklace=starting_items_section.get("holeladennecklace", True),
-                messmerskindling=starting_items_section.get("messmerskindling", True),
-                talisman_pouches=starting_items_section.get("talisman_pouches", 3),
-                golden_seeds=starting_items_section.get("golden_seeds", 0),
-                sacred_tears=starting_items_section.get("sacred_tears", 0),
-                starting_runes=starting_items_section.get("starting_runes", 0),
-                larval_tears=starting_items_section.get("larval_tears", 10),
-                stonesword_keys=starting_items_section.get("stonesword_keys", 6),
-            ),
-            item_randomizer=ItemRandomizerConfig(
-                enabled=item_randomizer_section.get("enabled", True),
-                difficulty=item_randomizer_section.get("difficulty", 50),
-                remove_requirements=item_randomizer_section.get(
-                    "remove_requirements", True
-                ),
-                auto_upgrade_weapons=item_randomizer_section.get(
-                    "auto_upgrade_weapons", True
-                ),
-                auto_upgrade_dropped=item_randomizer_section.get(
-                    "auto_upgrade_dropped", True
-                ),
-                reduce_upgrade_cost=item_randomizer_section.get(
-                    "reduce_upgrade_cost", True
-                ),
-                auto_equip=item_randomizer_section.get("auto_equip", False),
-                dlc=item_randomizer_section.get("dlc", True),
-                nerf_gargoyles=item_randomizer_section.get("nerf_gargoyles", True),
-                nerf_malenia=item_randomizer_section.get("nerf_malenia", False),
-                allcraft=item_randomizer_section.get("allcraft", True),
-                item_preset=item_randomizer_section.get("item_preset", True),
-                item_preset_path=item_randomizer_section.get("item_preset_path", ""),
-            ),
-            care_package=CarePackageConfig(
-                enabled=care_package_section.get("enabled", False),
-                weapon_upgrade=care_package_section.get("weapon_upgrade", 8),
-                weapons=care_package_section.get("weapons", 5),
-                shields=care_package_section.get("shields", 2),
-                catalysts=care_package_section.get("catalysts", 2),
-                talismans=care_package_section.get("talismans", 4),
-                sorceries=care_package_section.get("sorceries", 5),
-                incantations=care_package_section.get("incantations", 5),
-                head_armor=care_package_section.get("head_armor", 2),
-                body_armor=care_package_section.get("body_armor", 2),
-                arm_armor=care_package_section.get("arm_armor", 2),
-                leg_armor=care_package_section.get("leg_armor", 2),
-                crystal_tears=care_package_section.get("crystal_tears", 5),
-                ashes_of_war=care_package_section.get("ashes_of_war", 0),
-            ),
-            enemy=EnemyConfig(
-                randomize_bosses=enemy_section.get("randomize_bosses", "none"),
-                ignore_arena_size=enemy_section.get("ignore_arena_size", False),
-                swap_boss=enemy_section.get("swap_boss", False),
-                dlc_bosses=enemy_section.get("dlc_bosses", True),
-                bosses=enemy_section.get("bosses", []),
+            care_package=_build_section(
+                CarePackageConfig, data.get("care_package", {})
             ),
+            enemy=_build_section(EnemyConfig, data.get("enemy", {})),
             plugins=data.get("plugin", {}),
         )
 
+    @classmethod
+    def from_toml_str(cls, text: str) -> Config:
+        """Load configuration from a TOML document held in memory."""
+        return cls.from_dict(tomllib.loads(text))
+
     @classmethod
     def from_toml(cls, path: str | Path) -> Config:
         """Load configuration from a TOML file."""
-        path = Path(path)
-        with path.open("rb") as f:
-            data = tomllib.load(f)
-        return cls.from_dict(data)
+        # Resolve first so the same file is cached once whatever the spelling,
+        # and a relative path never hits another directory's cached parse.
+        path = Path(path).resolve()
+        st = os.stat(path)
+        cached = _parse_toml_cached(str(path), st.st_mtime_ns, st.st_size)
+        return cls.from_dict(copy.deepcopy(dict(cached)))
 
 
 def load_config(path: str | Path) -> Config:
@@ -6,7 +6,11 @@ used to represent randomized speedrun routes.
 
 from __future__ import annotations
 
-from collections import deque
+import functools
+import operator
+import sys
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import NamedTuple
 
@@ -20,7 +24,19 @@ class FogRef(NamedTuple):
     zone: str
 
 
-@dataclass
+@functools.lru_cache(maxsize=8192)
+def fog_ref(fog_id: str, zone: str) -> FogRef:
+    """Return the canonical FogRef for a (fog_id, zone) pair.
+
+    The generator builds the same refs over and over (one per node exit and
+    per edge end). Sharing one instance per pair makes set/dict lookups and
+    edge comparisons hit the identity fast path. FogRef itself is a
+    NamedTuple and cannot hook construction, hence the factory.
+    """
+    return FogRef(fog_id, zone)
+
+
+@dataclass(slots=True)
 class DagNode:
     """A node in the DAG representing a cluster instance.
 
@@ -32,56 +48,88 @@ class DagNode:
     cluster: ClusterData
     layer: int
     tier: int  # Difficulty scaling (1-28)
-    entry_fogs: list[FogRef] = field(
-        default_factory=list
-    )  # FogRef pairs used to enter (empty for start)
-    exit_fogs: list[FogRef] = field(default_factory=list)  # Available exits
+    entry_fogs: tuple[FogRef, ...] = ()  # FogRef pairs used to enter (empty for start)
+    exit_fogs: tuple[FogRef, ...] = ()  # Available exits
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Intern the id (it keys every node/edge lookup) and freeze fog lists.
+
+        The generator updates entry_fogs and tier in place, so the node itself
+        stays mutable; only the id is treated as fixed, and its hash is
+        computed once here like DagEdge does.
+        """
+        self.id = sys.intern(self.id)
+        self.entry_fogs = tuple(self.entry_fogs)
+        self.exit_fogs = tuple(self.exit_fogs)
+        self._hash = hash(self.id)
 
     def __hash__(self) -> int:
         """Hash by id only."""
-        return hash(self.id)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         """Equality by id only."""
+        if self is other:
+            return True
         if not isinstance(other, DagNode):
             return NotImplemented
         return self.id == other.id
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DagEdge:
     """A directed edge between two nodes.
 
     Edges are identified by the tuple (source_id, target_id, exit_fog, entry_fog).
+    Edges are immutable once created.
     """
 
     source_id: str
     target_id: str
     exit_fog: FogRef  # The fog gate used to exit source (in source node's exit_fogs)
     entry_fog: FogRef  # The fog gate used to enter target (in target node's entry_fogs)
+    # Exit fog_id, kept for backward compatibility (plain slot, set once)
+    fog_id: str = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Intern endpoint ids and precompute derived fields.
 
-    @property
-    def fog_id(self) -> str:
-        """Return the exit fog_id string for backward compatibility."""
-        return self.exit_fog.fog_id
+        Edges are frozen, so fog_id and the identity hash are computed once
+        instead of on every access or set/dict lookup.
+        """
+        source_id = sys.intern(self.source_id)
+        target_id = sys.intern(self.target_id)
+        object.__setattr__(self, "source_id", source_id)
+        object.__setattr__(self, "target_id", target_id)
+        object.__setattr__(self, "fog_id", self.exit_fog.fog_id)
+        object.__setattr__(
+            self,
+            "_hash",
+            hash((source_id, target_id, self.exit_fog, self.entry_fog)),
+        )
 
     def __hash__(self) -> int:
         """Hash by (source_id, target_id, exit_fog, entry_fog) tuple."""
-        return hash((self.source_id, self.target_id, self.exit_fog, self.entry_fog))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         """Equality by (source_id, target_id, exit_fog, entry_fog) tuple."""
+        if self is other:
+            return True
         if not isinstance(other, DagEdge):
             return NotImplemented
+        # Refs built with fog_ref() are shared, so identity usually decides
         return (
             self.source_id == other.source_id
             and self.target_id == other.target_id
-            and self.exit_fog == other.exit_fog
-            and self.entry_fog == other.entry_fog
+            and (self.exit_fog is other.exit_fog or self.exit_fog == other.exit_fog)
+            and (self.entry_fog is other.entry_fog or self.entry_fog == other.entry_fog)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Dag:
     """The complete DAG structure.
 
@@ -96,10 +144,60 @@ class Dag:
     edges: list[DagEdge] = field(default_factory=list)
     start_id: str = ""
     end_id: str = ""
+    # Adjacency index (node id -> edges), maintained by add_edge so edge
+    # lookups are O(degree) instead of a scan over all edges.
+    _out: dict[str, list[DagEdge]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _in: dict[str, list[DagEdge]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Reachability sets by (direction, root), dropped whenever an edge is
+    # indexed, so repeated validate_structure calls on an unchanged DAG skip
+    # the BFS.
+    _reach_cache: dict[tuple[str, str], frozenset[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Zone multiset and per-type node counts, maintained by add_node so
+    # total_zones/count_by_type do not scan every node on each call.
+    _zone_counts: Counter[str] = field(
+        default_factory=Counter, init=False, repr=False, compare=False
+    )
+    _type_counts: Counter[str] = field(
+        default_factory=Counter, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index nodes and edges passed to the constructor."""
+        for node in self.nodes.values():
+            self._index_node(node)
+        for edge in self.edges:
+            self._index_edge(edge)
+
+    def _index_node(self, node: DagNode) -> None:
+        self._zone_counts.update(node.cluster.zones)
+        self._type_counts[node.cluster.type] += 1
+
+    def _unindex_node(self, node: DagNode) -> None:
+        self._type_counts[node.cluster.type] -= 1
+        self._zone_counts.subtract(node.cluster.zones)
+        for zone in node.cluster.zones:
+            if self._zone_counts[zone] <= 0:
+                del self._zone_counts[zone]
+
+    def _index_edge(self, edge: DagEdge) -> None:
+        self._out.setdefault(edge.source_id, []).append(edge)
+        self._in.setdefault(edge.target_id, []).append(edge)
+        if self._reach_cache:
+            self._reach_cache.clear()
 
     def add_node(self, node: DagNode) -> None:
-        """Add a node to the DAG."""
+        """Add a node to the DAG, replacing any node with the same id."""
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            self._unindex_node(previous)
         self.nodes[node.id] = node
+        self._index_node(node)
 
     def add_edge(
         self, source_id: str, target_id: str, exit_fog: FogRef, entry_fog: FogRef
@@ -112,7 +210,35 @@ class Dag:
             exit_fog: FogRef for the exit gate
             entry_fog: FogRef for the entry gate
         """
-        self.edges.append(DagEdge(source_id, target_id, exit_fog, entry_fog))
+        edge = DagEdge(source_id, target_id, exit_fog, entry_fog)
+        self.edges.append(edge)
+        self._index_edge(edge)
+
+    def bulk_add(
+        self,
+        nodes: Iterable[DagNode],
+        edges: Iterable[tuple[str, str, FogRef, FogRef]] = (),
+    ) -> None:
+        """Add many nodes and edges at once.
+
+        Equivalent to calling add_node/add_edge in order, but fills the node
+        dict and edge list with one update/extend each.
+
+        Args:
+            nodes: Nodes to add
+            edges: (source_id, target_id, exit_fog, entry_fog) tuples
+        """
+        new_nodes = {node.id: node for node in nodes}
+        for node_id, node in new_nodes.items():
+            previous = self.nodes.get(node_id)
+            if previous is not None:
+                self._unindex_node(previous)
+            self._index_node(node)
+        self.nodes.update(new_nodes)
+        start = len(self.edges)
+        self.edges.extend(DagEdge(*edge) for edge in edges)
+        for edge in self.edges[start:]:
+            self._index_edge(edge)
 
     def get_node(self, node_id: str) -> DagNode | None:
         """Get a node by id, or None if not found."""
@@ -120,11 +246,48 @@ class Dag:
 
     def get_outgoing_edges(self, node_id: str) -> list[DagEdge]:
         """Get all edges originating from a node."""
-        return [e for e in self.edges if e.source_id == node_id]
+        return list(self._out.get(node_id, ()))
 
     def get_incoming_edges(self, node_id: str) -> list[DagEdge]:
         """Get all edges targeting a node."""
-        return [e for e in self.edges if e.target_id == node_id]
+        return list(self._in.get(node_id, ()))
+
+    def iter_outgoing_edges(self, node_id: str) -> Iterator[DagEdge]:
+        """Iterate edges originating from a node without copying them.
+
+        The DAG must not gain edges while the iterator is being consumed.
+        """
+        return iter(self._out.get(node_id, ()))
+
+    def iter_incoming_edges(self, node_id: str) -> Iterator[DagEdge]:
+        """Iterate edges targeting a node without copying them.
+
+        The DAG must not gain edges while the iterator is being consumed.
+        """
+        return iter(self._in.get(node_id, ()))
+
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        """Whether an edge source_id -> target_id exists."""
+        return any(e.target_id == target_id for e in self._out.get(source_id, ()))
+
+    def out_degree(self, node_id: str) -> int:
+        """Number of edges originating from a node."""
+        return len(self._out.get(node_id, ()))
+
+    def in_degree(self, node_id: str) -> int:
+        """Number of edges targeting a node."""
+        return len(self._in.get(node_id, ()))
+
+    def nodes_by_layer(self) -> dict[int, list[DagNode]]:
+        """Group nodes by layer, in ascending layer order.
+
+        Edges always go to a higher layer, so this is a topological order.
+        Nodes within a layer keep their insertion order.
+        """
+        by_layer: dict[int, list[DagNode]] = {}
+        for node in self.nodes.values():
+            by_layer.setdefault(node.layer, []).append(node)
+        return {layer: by_layer[layer] for layer in sorted(by_layer)}
 
     def total_nodes(self) -> int:
         """Return the total number of nodes in the DAG."""
@@ -132,10 +295,7 @@ class Dag:
 
     def total_zones(self) -> int:
         """Return the count of unique zones across all nodes."""
-        all_zones: set[str] = set()
-        for node in self.nodes.values():
-            all_zones.update(node.cluster.zones)
-        return len(all_zones)
+        return len(self._zone_counts)
 
     def count_by_type(self, cluster_type: str) -> int:
         """Count nodes whose cluster matches the given type.
@@ -146,105 +306,112 @@ class Dag:
         Returns:
             Number of nodes with matching cluster type.
         """
-        return sum(
-            1 for node in self.nodes.values() if node.cluster.type == cluster_type
-        )
+        return self._type_counts[cluster_type]
 
     def validate_structure(self) -> list[str]:
         """Validate the DAG structure for correctness.
 
-        Checks:
-        - start_id and end_id are set
-        - start and end nodes exist
-        - All edges reference existing nodes
-        - No backward edges (source.layer >= target.layer)
-        - All nodes are reachable from start
-        - All nodes can reach end (no dead ends)
+        Checks run in tiers, cheapest first; a failing tier stops validation
+        since the later checks would only report its consequences:
+        1. start_id and end_id are set and reference existing nodes
+        2. All edges reference existing nodes; no backward edges
+           (source.layer >= target.layer)
+        3. All nodes are reachable from start and can reach end (no dead ends)
+
+        Backward edges do not stop validation: reachability is still
+        meaningful and reported alongside them.
 
         Returns:
             List of error messages. Empty list means valid.
         """
         errors: list[str] = []
+        nodes = self.nodes
 
-        # Check start_id and end_id are set
+        # Tier 1: start_id and end_id are set and exist
         if not self.start_id:
             errors.append("Missing start_id")
+        elif self.start_id not in nodes:
+            errors.append(f"Start node '{self.start_id}' not found in nodes")
         if not self.end_id:
             errors.append("Missing end_id")
-
-        # Check start and end nodes exist
-        if self.start_id and self.start_id not in self.nodes:
-            errors.append(f"Start node '{self.start_id}' not found in nodes")
-        if self.end_id and self.end_id not in self.nodes:
+        elif self.end_id not in nodes:
             errors.append(f"End node '{self.end_id}' not found in nodes")
+        if errors:
+            return errors
 
-        # Check all edges reference existing nodes and are forward edges
+        # Tier 2: all edges reference existing nodes and are forward edges
+        dangling = False
         for edge in self.edges:
-            if edge.source_id not in self.nodes:
+            source = nodes.get(edge.source_id)
+            target = nodes.get(edge.target_id)
+            if source is None:
                 errors.append(f"Edge source '{edge.source_id}' not found in nodes")
-            if edge.target_id not in self.nodes:
+            if target is None:
                 errors.append(f"Edge target '{edge.target_id}' not found in nodes")
 
             # Check for backward edges (only if both nodes exist)
-            if edge.source_id in self.nodes and edge.target_id in self.nodes:
-                source_layer = self.nodes[edge.source_id].layer
-                target_layer = self.nodes[edge.target_id].layer
-                if source_layer >= target_layer:
-                    errors.append(
-                        f"Backward edge from '{edge.source_id}' (layer {source_layer}) "
-                        f"to '{edge.target_id}' (layer {target_layer})"
-                    )
-
-        # Check reachability from start (only if start exists)
-        if self.start_id and self.start_id in self.nodes:
-            reachable = self._find_reachable_from_start()
-            for node_id in self.nodes:
-                if node_id not in reachable:
-                    errors.append(f"Node '{node_id}' is unreachable from start")
-
-        # Check all nodes can reach end (only if end exists)
-        if self.end_id and self.end_id in self.nodes:
-            can_reach_end = self._find_nodes_reaching_end()
-            for node_id in self.nodes:
-                if node_id not in can_reach_end:
-                    errors.append(f"Node '{node_id}' is a dead end (cannot reach end)")
+            if source is None or target is None:
+                dangling = True
+            elif source.layer >= target.layer:
+                errors.append(
+                    f"Backward edge from '{edge.source_id}' (layer {source.layer}) "
+                    f"to '{edge.target_id}' (layer {target.layer})"
+                )
+        if dangling:
+            return errors
+
+        # Tier 3: every node is reachable from start and can reach end
+        reachable = self._find_reachable_from_start()
+        for node_id in nodes:
+            if node_id not in reachable:
+                errors.append(f"Node '{node_id}' is unreachable from start")
+
+        can_reach_end = self._find_nodes_reaching_end()
+        for node_id in nodes:
+            if node_id not in can_reach_end:
+                errors.append(f"Node '{node_id}' is a dead end (cannot reach end)")
 
         return errors
 
-    def _find_reachable_from_start(self) -> set[str]:
+    def _find_reachable_from_start(self) -> frozenset[str]:
         """Find all nodes reachable from start via BFS."""
         if not self.start_id:
-            return set()
-
-        reachable: set[str] = set()
-        queue: deque[str] = deque([self.start_id])
+            return frozenset()
+        return self._reach("out", self.start_id)
 
-        while queue:
-            node_id = queue.popleft()  # O(1) instead of list.pop(0) which is O(n)
-            if node_id in reachable:
-                continue
-            reachable.add(node_id)
-            for edge in self.get_outgoing_edges(node_id):
-                if edge.target_id not in reachable:
-                    queue.append(edge.target_id)
-
-        return reachable
-
-    def _find_nodes_reaching_end(self) -> set[str]:
+    def _find_nodes_reaching_end(self) -> frozenset[str]:
         """Find all nodes that can reach end via reverse BFS."""
         if not self.end_id:
-            return set()
+            return frozenset()
+        return self._reach("in", self.end_id)
 
-        can_reach: set[str] = set()
-        queue: deque[str] = deque([self.end_id])
+    def _reach(self, direction: str, root: str) -> frozenset[str]:
+        """BFS from root over outgoing ("out") or incoming ("in") edges.
+
+        Results are cached until the next edge is added: the sets only depend
+        on the edges.
+        """
+        key = (direction, root)
+        cached = self._reach_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if direction == "out":
+            index, neighbor_of = self._out, operator.attrgetter("target_id")
+        else:
+            index, neighbor_of = self._in, operator.attrgetter("source_id")
+        # Nodes are marked when enqueued, so each is queued at most once
+        seen: set[str] = {root}
+        queue: deque[str] = deque([root])
 
         while queue:
             node_id = queue.popleft()  # O(1) instead of list.pop(0) which is O(n)
-            if node_id in can_reach:
-                continue
-            can_reach.add(node_id)
-            for edge in self.get_incoming_edges(node_id):
-                if edge.source_id not in can_reach:
-                    queue.append(edge.source_id)
-
-        return can_reach
+            for edge in index.get(node_id, ()):
+                neighbor = neighbor_of(edge)
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+
+        result = frozenset(seen)
+        self._reach_cache[key] = result
+        return result
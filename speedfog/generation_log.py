@@ -10,7 +10,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeEntry:
     """A node created at a layer."""
 
@@ -25,7 +25,7 @@ class NodeEntry:
     # intra-layer matching applies).
 
 
-@dataclass
+@dataclass(slots=True)
 class FallbackEntry:
     """A type fallback event at a layer."""
 
@@ -35,7 +35,7 @@ class FallbackEntry:
     reason: str  # pool_exhausted, zone_conflict
 
 
-@dataclass
+@dataclass(slots=True)
 class LayerEvent:
     """What happened at a single layer during generation."""
 
@@ -49,7 +49,7 @@ class LayerEvent:
     fallbacks: list[FallbackEntry] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanEvent:
     """Planner decisions captured before layer execution."""
 
@@ -63,7 +63,7 @@ class PlanEvent:
     final_boss: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryEvent:
     """End-of-generation summary statistics."""
 
@@ -75,7 +75,7 @@ class SummaryEvent:
     fallback_summary: list[tuple[int, str]]  # (layer, preferred_type)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequiredZonePlaced:
     """A zone from `requirements.zones` was placed during generation."""
 
@@ -85,7 +85,7 @@ class RequiredZonePlaced:
     slot: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationLog:
     """Accumulates structured events during DAG generation."""
 
@@ -13,7 +13,7 @@ file under docs/superpowers/specs/, not tracked in git).
 from __future__ import annotations
 
 import random
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field, replace
 from itertools import combinations
 
@@ -24,7 +24,7 @@ from speedfog.constants import (
     INTERMEDIATE_CLUSTER_TYPES,
     MAX_TIER,
 )
-from speedfog.dag import Dag, DagNode, FogRef
+from speedfog.dag import Dag, DagNode, fog_ref
 from speedfog.generation_log import (
     FallbackEntry,
     GenerationLog,
@@ -71,6 +71,26 @@ class GenerationResult:
 # =============================================================================
 
 
+def _proximity_blocked_specs(
+    cluster: ClusterData, entry_id: str, entry_zone: str
+) -> frozenset[str]:
+    """Specs of every proximity group the entry belongs to.
+
+    Depends only on the cluster's groups and the entry, while routing asks
+    for it once per consumed entry on every free-exit computation, so the
+    result is memoized on the cluster.
+    """
+    key = (entry_id, entry_zone)
+    blocked = cluster.proximity_blocked.get(key)
+    if blocked is None:
+        blocked_specs: set[str] = set()
+        for group in cluster.proximity_groups:
+            if any(fog_matches_spec(entry_id, entry_zone, spec) for spec in group):
+                blocked_specs.update(group)
+        blocked = cluster.proximity_blocked[key] = frozenset(blocked_specs)
+    return blocked
+
+
 def _filter_exits_by_proximity(
     cluster: ClusterData, entry: dict, exits: list[dict]
 ) -> list[dict]:
@@ -78,18 +98,7 @@ def _filter_exits_by_proximity(
     if not cluster.proximity_groups:
         return exits
 
-    entry_id = entry["fog_id"]
-    entry_zone = entry["zone"]
-
-    # Find all groups the entry belongs to
-    blocked_specs: set[str] = set()
-    for group in cluster.proximity_groups:
-        entry_in_group = any(
-            fog_matches_spec(entry_id, entry_zone, spec) for spec in group
-        )
-        if entry_in_group:
-            blocked_specs.update(group)
-
+    blocked_specs = _proximity_blocked_specs(cluster, entry["fog_id"], entry["zone"])
     if not blocked_specs:
         return exits
 
@@ -116,12 +125,48 @@ def compute_net_exits(cluster: ClusterData, consumed_entries: list[dict]) -> lis
     Returns:
         List of exit fog dicts remaining after consuming entries.
     """
+    if not consumed_entries:
+        return list(cluster.exit_fogs)
     consumed_set = {(e["fog_id"], e["zone"]) for e in consumed_entries}
     return [
-        f for f in cluster.exit_fogs if (f["fog_id"], f["zone"]) not in consumed_set
+        f
+        for f, key in zip(cluster.exit_fogs, cluster.exit_fog_keys, strict=True)
+        if key not in consumed_set
     ]
 
 
+def _remaining_exits(
+    cluster: ClusterData, consumed_keys: Iterable[tuple[str, str]]
+) -> list[tuple[dict, tuple[str, str]]]:
+    """Exits left after consuming entries, paired with their (fog_id, zone) key.
+
+    Same result as compute_net_exits followed by _filter_exits_by_proximity
+    for each consumed entry, but works on the precomputed fog keys: routing
+    holds FogRefs (already (fog_id, zone) tuples), not fog dicts.
+    """
+    consumed = set(consumed_keys)
+    if not consumed:
+        # Nothing consumed (the start node): every exit is left
+        return list(zip(cluster.exit_fogs, cluster.exit_fog_keys, strict=True))
+    remaining = [
+        (f, key)
+        for f, key in zip(cluster.exit_fogs, cluster.exit_fog_keys, strict=True)
+        if key not in consumed
+    ]
+    if cluster.proximity_groups:
+        for fog_id, zone in consumed:
+            blocked_specs = _proximity_blocked_specs(cluster, fog_id, zone)
+            if blocked_specs:
+                remaining = [
+                    (f, key)
+                    for f, key in remaining
+                    if not any(
+                        fog_matches_spec(key[0], key[1], spec) for spec in blocked_specs
+                    )
+                ]
+    return remaining
+
+
 def count_net_exits(cluster: ClusterData, num_entries: int) -> int:
     """Minimum net exits when consuming num_entries (greedy: prefer non-bidirectional).
 
@@ -145,29 +190,54 @@ def count_net_exits(cluster: ClusterData, num_entries: int) -> int:
         return 0
 
     if not cluster.proximity_groups:
-        # Fast path: no proximity constraints
-        exit_keys = {(f["fog_id"], f["zone"]) for f in cluster.exit_fogs}
-        entry_costs: list[tuple[dict, int]] = []
-        for entry in cluster.entry_fogs:
-            key = (entry["fog_id"], entry["zone"])
-            cost = 1 if key in exit_keys else 0
-            entry_costs.append((entry, cost))
-        entry_costs.sort(key=lambda x: x[1])
-        consumed = [entry for entry, _ in entry_costs[:num_entries]]
-        return len(compute_net_exits(cluster, consumed))
-
-    # With proximity: worst-case across all entry combinations.
-    # For each combination, compute net exits and filter by entry proximity
-    # (entry-vs-exit). Exits sharing a group only with each other still count.
-    min_exits = len(cluster.exit_fogs)
-    for combo in combinations(cluster.entry_fogs, num_entries):
-        consumed = list(combo)
-        net = compute_net_exits(cluster, consumed)
-        for entry in consumed:
-            net = _filter_exits_by_proximity(cluster, entry, net)
-        min_exits = min(min_exits, len(net))
-
-    return min_exits
+        # Fast path: no proximity constraints. Non-bidirectional entries cost
+        # nothing, so only the entries consumed beyond those remove exits.
+        bidirectional = cluster.bidirectional_keys
+        costly = num_entries - (len(cluster.entry_fogs) - len(bidirectional))
+        if costly <= 0:
+            return len(cluster.exit_fogs)
+        consumed_set = set(bidirectional[:costly])
+        return sum(1 for key in cluster.exit_fog_keys if key not in consumed_set)
+
+    # With proximity: worst-case across entry combinations. Each entry removes
+    # a fixed set of exits (its own side of a bidirectional gate, plus exits
+    # sharing a proximity group with it; exits sharing a group only with each
+    # other still count). Entries with the same removal set are
+    # interchangeable and extra entries never give exits back, so only
+    # combinations of distinct removal sets need to be checked.
+    removals = {_exits_removed_by_entry(cluster, entry) for entry in cluster.entry_fogs}
+    total = len(cluster.exit_fogs)
+    max_removed = 0
+    for combo in combinations(removals, min(num_entries, len(removals))):
+        max_removed = max(max_removed, len(frozenset().union(*combo)))
+        if max_removed == total:
+            break  # Can't get worse than no exits
+
+    return total - max_removed
+
+
+def _exits_removed_by_entry(cluster: ClusterData, entry: dict) -> frozenset[int]:
+    """Indices of the cluster exits that consuming entry makes unusable."""
+    entry_key = (entry["fog_id"], entry["zone"])
+    blocked_specs = _proximity_blocked_specs(cluster, entry["fog_id"], entry["zone"])
+    return frozenset(
+        i
+        for i, (fog_id, zone) in enumerate(cluster.exit_fog_keys)
+        if (fog_id, zone) == entry_key
+        or any(fog_matches_spec(fog_id, zone, spec) for spec in blocked_specs)
+    )
+
+
+def _single_entry_net_exits(cluster: ClusterData) -> int:
+    """Return count_net_exits(cluster, 1), memoized on the cluster.
+
+    Split and passant checks ask this for every candidate on every retry,
+    while the answer only changes when the cluster's fogs do.
+    """
+    net = cluster.single_entry_net_exits
+    if net is None:
+        net = cluster.single_entry_net_exits = count_net_exits(cluster, 1)
+    return net
 
 
 def can_be_split_node(cluster: ClusterData, num_out: int) -> bool:
@@ -185,7 +255,7 @@ def can_be_split_node(cluster: ClusterData, num_out: int) -> bool:
     """
     if cluster.allow_entry_as_exit:
         return len(cluster.entry_fogs) >= 1 and len(cluster.exit_fogs) >= num_out
-    return count_net_exits(cluster, 1) >= num_out
+    return _single_entry_net_exits(cluster) >= num_out
 
 
 def can_be_merge_node(cluster: ClusterData, num_in: int) -> bool:
@@ -219,7 +289,7 @@ def can_be_passant_node(cluster: ClusterData) -> bool:
     """
     if cluster.allow_entry_as_exit:
         return len(cluster.entry_fogs) >= 1 and len(cluster.exit_fogs) >= 1
-    return count_net_exits(cluster, 1) >= 1
+    return _single_entry_net_exits(cluster) >= 1
 
 
 def select_weighted_final_boss(
@@ -252,8 +322,8 @@ def select_weighted_final_boss(
         [zone_name] = rng.choices(zones, weights=weights, k=1)
 
         for cluster in boss_clusters:
-            if zone_name in cluster.zones:
-                if not any(z in used_zones for z in cluster.zones):
+            if zone_name in cluster.zone_set:
+                if cluster.zone_set.isdisjoint(used_zones):
                     return cluster
         # Zone unavailable (conflict), remove and retry with remaining candidates
         del remaining[zone_name]
@@ -408,14 +478,15 @@ def pick_cluster_weight_matched(
     available = [
         c
         for c in candidates
-        if not any(z in used_zones or z in reserved_zones for z in c.zones)
+        if c.zone_set.isdisjoint(used_zones)
+        and c.zone_set.isdisjoint(reserved_zones)
         and filter_fn(c)
     ]
     if not available:
         return None
 
     if required_zones:
-        preferred = [c for c in available if any(z in required_zones for z in c.zones)]
+        preferred = [c for c in available if not c.zone_set.isdisjoint(required_zones)]
         if preferred:
             available = preferred
 
@@ -432,11 +503,15 @@ def pick_cluster_weight_matched(
     if anchor_tolerance <= 0:
         return rng.choice(available)
 
+    # Distances are fixed for the call: compute them once and only build the
+    # matched subset for the first band that contains the nearest candidate.
+    distances = [abs(c.weight - anchor_weight) for c in available]
+    nearest = min(distances)
     tol = 0.0
     while tol <= anchor_tolerance + 1e-9:
-        matched = [c for c in available if abs(c.weight - anchor_weight) <= tol + 1e-9]
-        if matched:
-            return rng.choice(matched)
+        if nearest <= tol + 1e-9:
+            zipped = zip(available, distances, strict=True)
+            return rng.choice([c for c, d in zipped if d <= tol + 1e-9])
         tol += _TOLERANCE_STEP
 
     # No candidate within anchor_tolerance: fall back to uniform pick
@@ -486,12 +561,12 @@ def pick_cluster_uniform(
     available = [
         c
         for c in candidates
-        if not any(z in used_zones or z in reserved_zones for z in c.zones)
+        if c.zone_set.isdisjoint(used_zones) and c.zone_set.isdisjoint(reserved_zones)
     ]
     if not available:
         return None
     if required_zones:
-        preferred = [c for c in available if any(z in required_zones for z in c.zones)]
+        preferred = [c for c in available if not c.zone_set.isdisjoint(required_zones)]
         if preferred:
             available = preferred
     return rng.choice(available)
@@ -546,47 +621,44 @@ def _free_exits(dag: Dag, node_id: str) -> list[dict]:
     out exits already claimed by an outgoing edge.
     """
     node = dag.nodes[node_id]
-    used_exit = {
-        (e.exit_fog.fog_id, e.exit_fog.zone) for e in dag.get_outgoing_edges(node_id)
-    }
+    # FogRefs are (fog_id, zone) tuples: they hash and compare like the keys
+    used_exit = {e.exit_fog for e in dag.iter_outgoing_edges(node_id)}
     if node.cluster.allow_entry_as_exit:
         candidates = [
             f
-            for f in node.cluster.exit_fogs
-            if (f["fog_id"], f["zone"]) not in used_exit
+            for f, key in zip(
+                node.cluster.exit_fogs, node.cluster.exit_fog_keys, strict=True
+            )
+            if key not in used_exit
         ]
     else:
-        consumed_entries = [
-            {"fog_id": ef.fog_id, "zone": ef.zone} for ef in node.entry_fogs
+        candidates = [
+            f
+            for f, key in _remaining_exits(node.cluster, node.entry_fogs)
+            if key not in used_exit
         ]
-        net = compute_net_exits(node.cluster, consumed_entries)
-        for entry in consumed_entries:
-            net = _filter_exits_by_proximity(node.cluster, entry, net)
-        candidates = [f for f in net if (f["fog_id"], f["zone"]) not in used_exit]
     return candidates
 
 
 def _fog_blocked_by_used_exits(
-    fog: dict, cluster: ClusterData, used_exit_keys: set[tuple[str, str]]
+    fog_key: tuple[str, str],
+    cluster: ClusterData,
+    used_exit_keys: set[tuple[str, str]],
 ) -> bool:
     """True if fog shares a proximity group with any used exit.
 
     Used for the entry-vs-exit constraint: an entry fog cannot be picked when
     it shares a proximity group with an exit already used on the same source.
     """
-    for group in cluster.proximity_groups:
-        fog_in = any(
-            fog_matches_spec(fog["fog_id"], fog["zone"], spec) for spec in group
-        )
-        if not fog_in:
-            continue
-        if any(
-            fog_matches_spec(fid, z, spec)
-            for fid, z in used_exit_keys
-            for spec in group
-        ):
-            return True
-    return False
+    if not cluster.proximity_groups or not used_exit_keys:
+        return False
+    # Union of the groups containing the fog (memoized per cluster and fog)
+    blocked_specs = _proximity_blocked_specs(cluster, *fog_key)
+    return any(
+        fog_matches_spec(fid, z, spec)
+        for fid, z in used_exit_keys
+        for spec in blocked_specs
+    )
 
 
 def _free_entries(dag: Dag, node_id: str) -> list[dict]:
@@ -596,17 +668,24 @@ def _free_entries(dag: Dag, node_id: str) -> list[dict]:
     are: bidirectional pair already consumed as an exit on this node, and the
     entry-vs-exit proximity constraint against already-used exits.
     """
+    return [entry for entry, _key in _free_entry_pairs(dag, node_id)]
+
+
+def _free_entry_pairs(dag: Dag, node_id: str) -> list[tuple[dict, tuple[str, str]]]:
+    """_free_entries, with each entry paired with its (fog_id, zone) key."""
     node = dag.nodes[node_id]
-    used_exit_keys = {
-        (e.exit_fog.fog_id, e.exit_fog.zone) for e in dag.get_outgoing_edges(node_id)
+    used_exit_keys: set[tuple[str, str]] = {
+        e.exit_fog for e in dag.iter_outgoing_edges(node_id)
     }
-    candidates: list[dict] = []
-    for entry in node.cluster.entry_fogs:
-        if (entry["fog_id"], entry["zone"]) in used_exit_keys:
+    candidates: list[tuple[dict, tuple[str, str]]] = []
+    for entry, key in zip(
+        node.cluster.entry_fogs, node.cluster.entry_fog_keys, strict=True
+    ):
+        if key in used_exit_keys:
             continue
-        if _fog_blocked_by_used_exits(entry, node.cluster, used_exit_keys):
+        if _fog_blocked_by_used_exits(key, node.cluster, used_exit_keys):
             continue
-        candidates.append(entry)
+        candidates.append((entry, key))
     return candidates
 
 
@@ -625,28 +704,22 @@ def _safe_entry_candidates(dag: Dag, target: DagNode) -> list[dict]:
     Multiple sources may share the same entry fog. compute_net_exits uses set semantics, so repeating the same
     entry fog does not compound exit consumption.
     """
-    free_entries = _free_entries(dag, target.id)
+    free_entries = _free_entry_pairs(dag, target.id)
     if not free_entries:
         return []
     if target.cluster.allow_entry_as_exit:
         # Entries don't consume exits for these clusters; all free entries are safe.
-        return free_entries
-    current_incoming = dag.get_incoming_edges(target.id)
-    current_entries = [
-        {"fog_id": e.entry_fog.fog_id, "zone": e.entry_fog.zone}
-        for e in current_incoming
-    ]
-    used_exit_keys = {
-        (e.exit_fog.fog_id, e.exit_fog.zone) for e in dag.get_outgoing_edges(target.id)
+        return [entry for entry, _key in free_entries]
+    current_keys: set[tuple[str, str]] = {
+        e.entry_fog for e in dag.iter_incoming_edges(target.id)
+    }
+    used_exit_keys: set[tuple[str, str]] = {
+        e.exit_fog for e in dag.iter_outgoing_edges(target.id)
     }
     safe: list[dict] = []
-    for candidate_entry in free_entries:
-        simulated_entries = current_entries + [candidate_entry]
-        net = compute_net_exits(target.cluster, simulated_entries)
-        for entry in simulated_entries:
-            net = _filter_exits_by_proximity(target.cluster, entry, net)
-        remaining = [f for f in net if (f["fog_id"], f["zone"]) not in used_exit_keys]
-        if remaining:
+    for candidate_entry, candidate_key in free_entries:
+        remaining = _remaining_exits(target.cluster, current_keys | {candidate_key})
+        if any(key not in used_exit_keys for _f, key in remaining):
             safe.append(candidate_entry)
     return safe
 
@@ -673,7 +746,7 @@ def connect_nodes(
     remaining exit (non-destructive entries), falling back to any free entry
     only when no safe choice exists.
     """
-    if any(e.source_id == source.id and e.target_id == target.id for e in dag.edges):
+    if dag.has_edge(source.id, target.id):
         return False
     src_exits = _free_exits(dag, source.id)
     tgt_entries = _free_entries(dag, target.id)
@@ -686,21 +759,25 @@ def connect_nodes(
     # capacity since compute_net_exits uses set semantics on consumed entries.
     existing_incoming = dag.get_incoming_edges(target.id)
     if existing_incoming:
-        canonical = existing_incoming[0].entry_fog
-        entry_fog = {"fog_id": canonical.fog_id, "zone": canonical.zone}
+        entry_ref = existing_incoming[0].entry_fog
     else:
         # First edge to this target: pick a safe entry, preferring main-tagged
         # entries (FogMod's getMainSpawnPoint requires the main entrance to be
         # connected to prevent Marika-effigy softlocks in boss arenas).
         safe_entries = _safe_entry_candidates(dag, target)
         entry_pool = safe_entries if safe_entries else tgt_entries
-        main_entries = [e for e in entry_pool if e.get("main")]
+        main_entries = (
+            [e for e in entry_pool if e.get("main")]
+            if target.cluster.has_main_entry
+            else []
+        )
         entry_fog = rng.choice(main_entries if main_entries else entry_pool)
+        entry_ref = fog_ref(entry_fog["fog_id"], entry_fog["zone"])
     dag.add_edge(
         source.id,
         target.id,
-        FogRef(exit_fog["fog_id"], exit_fog["zone"]),
-        FogRef(entry_fog["fog_id"], entry_fog["zone"]),
+        fog_ref(exit_fog["fog_id"], exit_fog["zone"]),
+        entry_ref,
     )
     return True
 
@@ -716,8 +793,7 @@ def _pick_source_with_compatible_exit(
     candidates = [
         s
         for s in sources
-        if _free_exits(dag, s.id)
-        and not any(e.source_id == s.id and e.target_id == target.id for e in dag.edges)
+        if _free_exits(dag, s.id) and not dag.has_edge(s.id, target.id)
     ]
     if not candidates:
         return None
@@ -745,9 +821,7 @@ def route_exits(
             s
             for s in sources
             if _free_exits(dag, s.id)
-            and not any(
-                e.source_id == s.id and e.target_id == target.id for e in dag.edges
-            )
+            and not dag.has_edge(s.id, target.id)
             and _target_has_free_exit_remaining(dag, target)
         ]
         if candidates:
@@ -772,19 +846,13 @@ def route_exits(
     shuffled_sources = list(sources)
     rng.shuffle(shuffled_sources)
     for source in shuffled_sources:
-        if dag.get_outgoing_edges(source.id):
+        if dag.out_degree(source.id):
             continue  # already has an outgoing edge from Phase 1
         if not _free_exits(dag, source.id):
             continue  # natural terminal: all exits consumed by bidirectional pairing
         # Find a target this source can connect to.
         # Prefer targets that still have exits remaining after the new entry.
-        not_yet_targeted = [
-            t
-            for t in targets
-            if not any(
-                e.source_id == source.id and e.target_id == t.id for e in dag.edges
-            )
-        ]
+        not_yet_targeted = [t for t in targets if not dag.has_edge(source.id, t.id)]
         # Prefer targets that won't become dead ends
         preferred = [
             t for t in not_yet_targeted if _target_has_free_exit_remaining(dag, t)
@@ -805,7 +873,7 @@ def route_exits(
     # target still has exits left after absorbing the new entry (so it won't
     # become a dead end on the NEXT routing step).
     for source in sources:
-        already_targeted = {e.target_id for e in dag.get_outgoing_edges(source.id)}
+        already_targeted = {e.target_id for e in dag.iter_outgoing_edges(source.id)}
         available_targets = [t for t in targets if t.id not in already_targeted]
         rng.shuffle(available_targets)
         for target in available_targets:
@@ -985,8 +1053,8 @@ def generate_dag(
         cluster=start,
         layer=0,
         tier=1,
-        entry_fogs=[],
-        exit_fogs=[FogRef(f["fog_id"], f["zone"]) for f in start.exit_fogs],
+        entry_fogs=(),
+        exit_fogs=tuple(fog_ref(*key) for key in start.exit_fog_keys),
     )
     dag.add_node(start_node)
     dag.start_id = start_node.id
@@ -1065,8 +1133,8 @@ def generate_dag(
                 cluster=c,
                 layer=layer_idx,
                 tier=1,
-                entry_fogs=[],
-                exit_fogs=[FogRef(f["fog_id"], f["zone"]) for f in c.exit_fogs],
+                entry_fogs=(),
+                exit_fogs=tuple(fog_ref(*key) for key in c.exit_fog_keys),
             )
             dag.add_node(node)
             next_nodes.append(node)
@@ -1087,7 +1155,7 @@ def generate_dag(
 
         # Record entry_fogs on each next node from incoming edges
         for n in next_nodes:
-            n.entry_fogs = [e.entry_fog for e in dag.get_incoming_edges(n.id)]
+            n.entry_fogs = tuple(e.entry_fog for e in dag.iter_incoming_edges(n.id))
 
         phase = "saturation" if remaining > current_width else "convergence"
         node_entries: list[NodeEntry] = []
@@ -1121,13 +1189,15 @@ def generate_dag(
         cluster=final_boss,
         layer=total_target - 1,
         tier=MAX_TIER,
-        entry_fogs=[],
-        exit_fogs=[],
+        entry_fogs=(),
+        exit_fogs=(),
     )
     dag.add_node(boss_node)
     dag.end_id = boss_node.id
     route_exits(dag, current_layer_nodes, [boss_node], rng)
-    boss_node.entry_fogs = [e.entry_fog for e in dag.get_incoming_edges(boss_node.id)]
+    boss_node.entry_fogs = tuple(
+        e.entry_fog for e in dag.iter_incoming_edges(boss_node.id)
+    )
 
     # 6. Tier assignment
     for node in dag.nodes.values():
@@ -1141,7 +1211,6 @@ def generate_dag(
         )
 
     # 7. Build summary
-    all_fallbacks = [fb for le in log.layer_events for fb in le.fallbacks]
     fallback_summary = [
         (le.layer, fb.preferred_type) for le in log.layer_events for fb in le.fallbacks
     ]
@@ -1152,7 +1221,7 @@ def generate_dag(
         convergence_layers=sum(
             1 for le in log.layer_events if le.phase == "convergence"
         ),
-        fallback_count=len(all_fallbacks),
+        fallback_count=len(fallback_summary),
         fallback_summary=fallback_summary,
     )
     return dag, log
@@ -1216,11 +1285,14 @@ def generate_with_retry(
         )
 
     # Auto-reroll mode: generate with fresh seeds until one succeeds.
-    # Each attempt uses a config copy with the attempt seed set.
-    base_rng = random.Random()
+    # Each attempt uses a config copy with the attempt seed set. The attempt
+    # seeds are drawn up front without replacement, so a seed that already
+    # failed is never retried. A non-positive max_attempts makes no attempt.
+    attempt_seeds = random.Random().sample(
+        range(1, 1_000_000_000), max(max_attempts, 0)
+    )
 
-    for attempt in range(max_attempts):
-        seed = base_rng.randint(1, 999999999)
+    for attempt, seed in enumerate(attempt_seeds):
         attempt_config = replace(config, seed=seed)
         try:
             dag, log = generate_dag(
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import tomllib
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -139,14 +140,14 @@ def effective_type(node: DagNode, dag: Dag) -> str:
     return node.cluster.type
 
 
-def _get_fog_text_from_list(fogs: list[dict[str, str]], fog_ref: FogRef) -> str:
+def _get_fog_text_from_list(fogs: Sequence[dict[str, str]], fog_ref: FogRef) -> str:
     """Get the human-readable text for a fog gate from a list of fog dicts.
 
     Prefers exact (fog_id, zone) match, then falls back to fog_id-only match.
     Prefers side_text (zone-specific description) over gate-level text.
 
     Args:
-        fogs: List of fog dicts (entry_fogs or exit_fogs)
+        fogs: Sequence of fog dicts (entry_fogs or exit_fogs)
         fog_ref: The FogRef to find
 
     Returns:
@@ -398,9 +399,9 @@ def dag_to_dict(
         #   2. Source uses one of its own entry fogs as this exit (only possible
         #      when source has allow_entry_as_exit), meaning the same physical
         #      gate already has an incoming connection on this cluster.
-        source_uses_entry_as_exit = source_node.cluster.allow_entry_as_exit and any(
-            ef["fog_id"] == edge.exit_fog.fog_id and ef["zone"] == edge.exit_fog.zone
-            for ef in source_node.cluster.entry_fogs
+        source_uses_entry_as_exit = (
+            source_node.cluster.allow_entry_as_exit
+            and edge.exit_fog in source_node.cluster.entry_keys
         )
         if target_node.cluster.allow_entry_as_exit or source_uses_entry_as_exit:
             conn_dict["ignore_pair"] = True
@@ -449,7 +450,10 @@ def dag_to_dict(
         if node.cluster.boss_name:
             nodes[node.cluster.id]["boss_name"] = node.cluster.boss_name
 
-    # Populate exits from DAG edges
+    # Populate exits/entrances and the unique (from, to) cluster pairs of the
+    # edges section in one pass over the DAG edges.
+    seen_edges: set[tuple[str, str]] = set()
+    edges_list: list[dict[str, str]] = []
     for edge in dag.edges:
         source_node = dag.nodes.get(edge.source_id)
         target_node = dag.nodes.get(edge.target_id)
@@ -457,6 +461,7 @@ def dag_to_dict(
             continue
         source_cluster_id = source_node.cluster.id
         target_cluster_id = target_node.cluster.id
+
         text = get_fog_text(source_node, edge.exit_fog)
         from_zone = edge.exit_fog.zone
         exit_entry: dict[str, str] = {
@@ -471,14 +476,7 @@ def dag_to_dict(
         exit_entry["to"] = target_cluster_id
         nodes[source_cluster_id]["exits"].append(exit_entry)
 
-    # Populate entrances from DAG edges (mirror of exits)
-    for edge in dag.edges:
-        source_node = dag.nodes.get(edge.source_id)
-        target_node = dag.nodes.get(edge.target_id)
-        if source_node is None or target_node is None:
-            continue
-        source_cluster_id = source_node.cluster.id
-        target_cluster_id = target_node.cluster.id
+        # Entrance (mirror of the exit)
         text = get_entry_fog_text(target_node, edge.entry_fog)
         to_zone = edge.entry_fog.zone
         # Handle final boss edge case: empty entry_fog means use first zone of target
@@ -496,15 +494,7 @@ def dag_to_dict(
                 entrance_entry["to_text"] = to_text
         nodes[target_cluster_id]["entrances"].append(entrance_entry)
 
-    # Build edges section: unique (from, to) pairs by cluster_id
-    seen_edges: set[tuple[str, str]] = set()
-    edges_list: list[dict[str, str]] = []
-    for edge in dag.edges:
-        source_node = dag.nodes.get(edge.source_id)
-        target_node = dag.nodes.get(edge.target_id)
-        if source_node is None or target_node is None:
-            continue
-        pair = (source_node.cluster.id, target_node.cluster.id)
+        pair = (source_cluster_id, target_cluster_id)
         if pair not in seen_edges:
             seen_edges.add(pair)
             edges_list.append({"from": pair[0], "to": pair[1]})
@@ -727,5 +717,5 @@ def export_json(
     """
     data = dag_to_dict(dag, clusters, export)
     validate_graph_dict(data)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    # One write: json.dump with indent streams many small chunks to the file
+    output_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
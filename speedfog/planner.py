@@ -6,6 +6,7 @@ This module handles planning what type of cluster goes in each layer of the DAG.
 from __future__ import annotations
 
 import random
+from itertools import accumulate
 
 from speedfog.config import RequirementsConfig
 from speedfog.constants import MAX_TIER
@@ -107,15 +108,17 @@ def _distribute_padding(
 
     # Phase 2: distribute remainder randomly, still respecting caps
     if still_needed > 0:
-        available = {t: caps[t] - allocs[t] for t in remaining if caps[t] > allocs[t]}
-        while still_needed > 0 and available:
-            types_list = list(available.keys())
-            weights = [remaining[t] for t in types_list]
-            pick = rng.choices(types_list, weights=weights, k=1)[0]
+        # Population and cumulative weights only change when a type fills up;
+        # cum_weights draws exactly like weights= would.
+        types_list = [t for t in remaining if caps[t] > allocs[t]]
+        cum_weights = list(accumulate(remaining[t] for t in types_list))
+        while still_needed > 0 and types_list:
+            pick = rng.choices(types_list, cum_weights=cum_weights, k=1)[0]
             allocs[pick] = allocs.get(pick, 0) + 1
             still_needed -= 1
             if allocs[pick] >= caps[pick]:
-                del available[pick]
+                types_list.remove(pick)
+                cum_weights = list(accumulate(remaining[t] for t in types_list))
 
     # Phase 3: if caps were too restrictive (total caps < padding_needed),
     # relax the 50% cap and assign remainder to the largest-pool type.
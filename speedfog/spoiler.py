@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Any
 
 from speedfog.care_package import CarePackageItem
-from speedfog.dag import Dag, FogRef
+from speedfog.dag import Dag
 from speedfog.graph_export import effective_type, get_fog_text
 
 
@@ -40,13 +40,16 @@ def _build_connection_lines(
     Returns:
         List of strings representing the connection lines
     """
-    # Build edge list as (src_idx, tgt_idx) pairs
+    # Build edge list as (src_idx, tgt_idx) pairs from the previous layer's
+    # outgoing edges (each source keeps its edge insertion order)
+    curr_index = {node_id: i for i, node_id in enumerate(curr_node_ids)}
     edges: list[tuple[int, int]] = []
-    for edge in dag.edges:
-        if edge.source_id in prev_node_ids and edge.target_id in curr_node_ids:
-            src_idx = prev_node_ids.index(edge.source_id)
-            tgt_idx = curr_node_ids.index(edge.target_id)
-            if (src_idx, tgt_idx) not in edges:
+    seen_pairs: set[tuple[int, int]] = set()
+    for src_idx, src_id in enumerate(prev_node_ids):
+        for edge in dag.iter_outgoing_edges(src_id):
+            tgt_idx = curr_index.get(edge.target_id)
+            if tgt_idx is not None and (src_idx, tgt_idx) not in seen_pairs:
+                seen_pairs.add((src_idx, tgt_idx))
                 edges.append((src_idx, tgt_idx))
 
     n_prev = len(prev_node_ids)
@@ -331,18 +334,18 @@ def _build_connection_lines(
                     row3[tgt_pos] = "│"
 
             # Count sources from each side and place bars at spaced positions
-            left_sources = [s for s in sources if prev_centers[s] < tgt_pos]
-            right_sources = [s for s in sources if prev_centers[s] > tgt_pos]
+            left_count = sum(1 for s in sources if prev_centers[s] < tgt_pos)
+            right_count = sum(1 for s in sources if prev_centers[s] > tgt_pos)
 
             # Place bars for sources from the left (at tgt_pos - 2, -4, -6, ...)
-            for i in range(len(left_sources)):
+            for i in range(left_count):
                 offset = 2 + i * 2
                 bar_pos = tgt_pos - offset
                 if 0 <= bar_pos < total_width and row3[bar_pos] == " ":
                     row3[bar_pos] = "│"
 
             # Place bars for sources from the right (at tgt_pos + 2, +4, +6, ...)
-            for i in range(len(right_sources)):
+            for i in range(right_count):
                 offset = 2 + i * 2
                 bar_pos = tgt_pos + offset
                 if 0 <= bar_pos < total_width and row3[bar_pos] == " ":
@@ -357,45 +360,24 @@ def _build_connection_lines(
     return lines
 
 
-def export_spoiler_log(
-    dag: Dag,
-    output_path: Path,
-    care_package: list[CarePackageItem] | None = None,
-) -> None:
-    """Export human-readable spoiler log with ASCII graph visualization.
-
-    Args:
-        dag: The DAG to export
-        output_path: Path to write the spoiler log
-        care_package: Optional care package items to include in spoiler
-    """
+def _build_ascii_graph(dag: Dag) -> list[str]:
+    """Render the DAG as layered ASCII columns joined by connection lines."""
     lines: list[str] = []
 
-    # Header
-    lines.append("=" * 60)
-    lines.append(f"SPEEDFOG SPOILER (seed: {dag.seed})")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("=" * 60)
-    lines.append(f"Total zones: {dag.total_zones()}")
-    lines.append("")
-
     # Group nodes by layer
-    nodes_by_layer: dict[int, list[str]] = {}
-    for node_id, node in dag.nodes.items():
-        layer = node.layer
-        if layer not in nodes_by_layer:
-            nodes_by_layer[layer] = []
-        nodes_by_layer[layer].append(node_id)
+    nodes_by_layer: dict[int, list[str]] = {
+        layer: [node.id for node in nodes]
+        for layer, nodes in dag.nodes_by_layer().items()
+    }
 
     # Sort layers and node IDs within each layer using barycentric ordering
     # This minimizes edge crossings by placing nodes near their parents/children
     sorted_layers = sorted(nodes_by_layer.keys())
 
     # Build parent map: node_id -> list of parent node_ids
-    parents: dict[str, list[str]] = {nid: [] for nid in dag.nodes}
-    for edge in dag.edges:
-        if edge.target_id in parents:
-            parents[edge.target_id].append(edge.source_id)
+    parents: dict[str, list[str]] = {
+        nid: [e.source_id for e in dag.iter_incoming_edges(nid)] for nid in dag.nodes
+    }
 
     # First pass: sort first layer alphabetically (no parents to reference)
     if sorted_layers:
@@ -485,19 +467,44 @@ def export_spoiler_log(
         info_line = " " * offset + "".join(info_parts)
         lines.append(info_line)
 
+    return lines
+
+
+def export_spoiler_log(
+    dag: Dag,
+    output_path: Path,
+    care_package: list[CarePackageItem] | None = None,
+    *,
+    include_graph: bool = True,
+) -> None:
+    """Export human-readable spoiler log with ASCII graph visualization.
+
+    Args:
+        dag: The DAG to export
+        output_path: Path to write the spoiler log
+        care_package: Optional care package items to include in spoiler
+        include_graph: Render the ASCII graph (the costliest section); when
+            False the log only has the header, node details and care package
+    """
+    lines: list[str] = []
+
+    # Header
+    lines.append("=" * 60)
+    lines.append(f"SPEEDFOG SPOILER (seed: {dag.seed})")
+    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append("=" * 60)
+    lines.append(f"Total zones: {dag.total_zones()}")
+    lines.append("")
+
+    if include_graph:
+        lines.extend(_build_ascii_graph(dag))
+
     # NODE DETAILS section
     lines.append("")
     lines.append("=" * 60)
     lines.append("NODE DETAILS")
     lines.append("=" * 60)
 
-    # Build edge lookup: source_id -> list of (target_id, exit_fog FogRef)
-    outgoing_edges: dict[str, list[tuple[str, FogRef]]] = {}
-    for edge in dag.edges:
-        if edge.source_id not in outgoing_edges:
-            outgoing_edges[edge.source_id] = []
-        outgoing_edges[edge.source_id].append((edge.target_id, edge.exit_fog))
-
     # Print node details sorted by tier then by cluster ID
     sorted_nodes = sorted(dag.nodes.values(), key=lambda n: (n.tier, n.cluster.id))
     for node in sorted_nodes:
@@ -510,10 +517,11 @@ def export_spoiler_log(
         lines.append(f"  Weight: {round(node.cluster.weight, 2):g}")
 
         # Exits with fog_id and text
-        exits = outgoing_edges.get(node.id, [])
+        exits = dag.get_outgoing_edges(node.id)
         if exits:
             lines.append("  Exits:")
-            for target_id, fog_ref in exits:
+            for edge in exits:
+                target_id, fog_ref = edge.target_id, edge.exit_fog
                 target_node = dag.nodes.get(target_id)
                 target_name = target_node.cluster.id if target_node else target_id
                 text = get_fog_text(node, fog_ref)
@@ -535,8 +543,7 @@ def export_spoiler_log(
             lines.append(f"  [{type_label}] {item.name} (id={item.id})")
 
     # Write to file
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    output_path.write_text("\n".join(lines), encoding="utf-8")
 
 
 def append_boss_placements_to_spoiler(
@@ -562,5 +569,4 @@ def append_boss_placements_to_spoiler(
         lines.append(f"  Arena #{target_id} -> {info['name']} (#{info['entity_id']})")
 
     with open(spoiler_path, "a", encoding="utf-8") as f:
-        f.write("\n".join(lines))
-        f.write("\n")
+        f.write("\n".join(lines) + "\n")
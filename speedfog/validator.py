@@ -172,15 +172,20 @@ def _check_zone_types_allowed(
     attempt fails obscurely.
     """
     allowed = set(config.requirements.allowed_types)
+    if not config.requirements.zones:
+        return
+    # First cluster listing each zone, so each lookup is a dict hit
+    zone_types: dict[str, str] = {}
+    for cluster in clusters.clusters:
+        for zone in cluster.zones:
+            zone_types.setdefault(zone, cluster.type)
     for zone in config.requirements.zones:
-        for cluster in clusters.clusters:
-            if zone in cluster.zones:
-                if cluster.type not in allowed:
-                    errors.append(
-                        f"Required zone '{zone}' has type '{cluster.type}' "
-                        f"which is not in allowed_types={sorted(allowed)}"
-                    )
-                break
+        cluster_type = zone_types.get(zone)
+        if cluster_type is not None and cluster_type not in allowed:
+            errors.append(
+                f"Required zone '{zone}' has type '{cluster_type}' "
+                f"which is not in allowed_types={sorted(allowed)}"
+            )
 
 
 def _check_no_duplicate_edges(dag: Dag) -> list[str]:
@@ -285,22 +290,15 @@ def _check_layer_weight_spread(
     """
     errors: list[str] = []
 
-    layers: dict[int, list[str]] = {}
-    for node_id, node in dag.nodes.items():
-        layers.setdefault(node.layer, []).append(node_id)
-
-    for layer_idx in sorted(layers):
-        node_ids = layers[layer_idx]
-        if len(node_ids) <= 1:
+    for layer_idx, nodes in dag.nodes_by_layer().items():
+        if len(nodes) <= 1:
             continue
+        clusters = [node.cluster for node in nodes]
 
-        weights = [dag.nodes[nid].cluster.weight for nid in node_ids]
+        weights = [c.weight for c in clusters]
         spread = max(weights) - min(weights)
         if spread > max_spread + 1e-9:
-            details = ", ".join(
-                f"{dag.nodes[nid].cluster.id}(w={dag.nodes[nid].cluster.weight})"
-                for nid in node_ids
-            )
+            details = ", ".join(f"{c.id}(w={c.weight})" for c in clusters)
             errors.append(
                 f"Layer {layer_idx}: weight spread {spread} > {max_spread} "
                 f"[{details}]"
@@ -326,21 +324,14 @@ def _check_layer_type_homogeneity(dag: Dag) -> list[str]:
     """
     errors: list[str] = []
 
-    # Group nodes by layer
-    layers: dict[int, list[str]] = {}
-    for node_id, node in dag.nodes.items():
-        layers.setdefault(node.layer, []).append(node_id)
-
-    for layer_idx in sorted(layers):
-        node_ids = layers[layer_idx]
-        if len(node_ids) <= 1:
+    for layer_idx, nodes in dag.nodes_by_layer().items():
+        if len(nodes) <= 1:
             continue
 
-        types = {dag.nodes[nid].cluster.type for nid in node_ids}
+        types = {node.cluster.type for node in nodes}
         if len(types) > 1:
             type_details = ", ".join(
-                f"{dag.nodes[nid].cluster.type}({dag.nodes[nid].cluster.id})"
-                for nid in node_ids
+                f"{node.cluster.type}({node.cluster.id})" for node in nodes
             )
             errors.append(f"Layer {layer_idx}: mixed types [{type_details}]")
 
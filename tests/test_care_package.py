@@ -343,9 +343,8 @@ class TestCarePackageConfig:
         assert config.care_package.crystal_tears == 5
         assert config.care_package.ashes_of_war == 0
 
-    def test_from_toml(self, tmp_path):
-        config_file = tmp_path / "config.toml"
-        config_file.write_text("""
+    def test_from_toml(self):
+        config = Config.from_toml_str("""
 [care_package]
 enabled = true
 weapon_upgrade = 10
@@ -362,7 +361,6 @@ leg_armor = 2
 crystal_tears = 5
 ashes_of_war = 4
 """)
-        config = Config.from_toml(config_file)
         assert config.care_package.enabled is True
         assert config.care_package.weapon_upgrade == 10
         assert config.care_package.weapons == 3
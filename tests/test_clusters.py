@@ -42,6 +42,52 @@ class TestClusterDataReuseFields:
         assert cluster.allow_entry_as_exit is True
 
 
+class TestClusterDataFogKeys:
+    """Tests for the precomputed (fog_id, zone) key fields."""
+
+    def test_keys_follow_fog_order(self):
+        """Key tuples are parallel to the fog tuples."""
+        data = {
+            "id": "test_1234",
+            "zones": ["zone_a", "zone_b"],
+            "type": "mini_dungeon",
+            "weight": 5,
+            "entry_fogs": [
+                {"fog_id": "fog_a", "zone": "zone_a"},
+                {"fog_id": "fog_b", "zone": "zone_b"},
+            ],
+            "exit_fogs": [
+                {"fog_id": "fog_b", "zone": "zone_b", "main": True},
+                {"fog_id": "fog_b", "zone": "zone_a"},
+            ],
+        }
+        cluster = ClusterData.from_dict(data)
+        assert cluster.entry_fog_keys == (("fog_a", "zone_a"), ("fog_b", "zone_b"))
+        assert cluster.exit_fog_keys == (("fog_b", "zone_b"), ("fog_b", "zone_a"))
+        assert cluster.entry_keys == frozenset(cluster.entry_fog_keys)
+        assert cluster.exit_keys == frozenset(cluster.exit_fog_keys)
+        # Same side of the fog_b gate only; (fog_b, zone_a) is the other side
+        assert cluster.bidirectional_keys == (("fog_b", "zone_b"),)
+        # Only exits are tagged main
+        assert cluster.has_main_entry is False
+
+    def test_has_main_entry(self):
+        """has_main_entry reflects the main tag on entry fogs."""
+        data = {
+            "id": "test_1234",
+            "zones": ["zone_a"],
+            "type": "boss_arena",
+            "weight": 1,
+            "entry_fogs": [
+                {"fog_id": "fog_a", "zone": "zone_a"},
+                {"fog_id": "fog_b", "zone": "zone_a", "main": True},
+            ],
+            "exit_fogs": [],
+        }
+        cluster = ClusterData.from_dict(data)
+        assert cluster.has_main_entry is True
+
+
 class TestClusterDataDisplayName:
     """Tests for display_name field on ClusterData."""
 
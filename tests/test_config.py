@@ -1,5 +1,7 @@
 """Tests for config parsing."""
 
+import os
+
 import pytest
 
 from speedfog.config import (
@@ -132,6 +134,34 @@ seed = 99
     assert config.requirements.bosses == 5
 
 
+def test_config_from_toml_reparses_modified_file(tmp_path):
+    """Cached TOML parses are invalidated when the file changes."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text('[requirements]\nzones = ["a"]\n')
+    first = Config.from_toml(config_file)
+    first.requirements.zones.append("mutated")
+    # Cached dict is not shared with the returned Config
+    assert Config.from_toml(config_file).requirements.zones == ["a"]
+
+    config_file.write_text('[requirements]\nzones = ["a", "b"]\n')
+    assert Config.from_toml(config_file).requirements.zones == ["a", "b"]
+
+
+def test_config_from_toml_relative_path_follows_cwd(tmp_path, monkeypatch):
+    """A relative path is cached per resolved file, not per spelling."""
+    for name, seed in (("a", 1), ("b", 2)):
+        (tmp_path / name).mkdir()
+        config_file = tmp_path / name / "config.toml"
+        config_file.write_text(f"[run]\nseed = {seed}\n")
+        # Identical stat keys, so only the path tells the files apart
+        os.utime(config_file, ns=(0, 0))
+
+    monkeypatch.chdir(tmp_path / "a")
+    assert Config.from_toml("config.toml").seed == 1
+    monkeypatch.chdir(tmp_path / "b")
+    assert Config.from_toml("config.toml").seed == 2
+
+
 def test_paths_defaults():
     """PathsConfig has correct defaults."""
     config = Config.from_dict({})
@@ -152,15 +182,13 @@ def test_structure_defaults():
     assert config.structure.tier_curve_exponent == 0.6
 
 
-def test_structure_new_options(tmp_path):
+def test_structure_new_options():
     """StructureConfig parses new DAG generation options."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 first_layer_type = "legacy_dungeon"
 final_boss_candidates = ["caelid_radahn", "haligtree_malenia", "leyndell_erdtree"]
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.first_layer_type == "legacy_dungeon"
     assert config.structure.final_boss_candidates == {
         "caelid_radahn": 1,
@@ -169,16 +197,14 @@ final_boss_candidates = ["caelid_radahn", "haligtree_malenia", "leyndell_erdtree
     }
 
 
-def test_structure_weighted_candidates(tmp_path):
+def test_structure_weighted_candidates():
     """StructureConfig parses weighted final_boss_candidates from TOML table."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure.final_boss_candidates]
 leyndell_erdtree = 5
 haligtree_malenia = 3
 stormveil_godrick = 1
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.final_boss_candidates == {
         "leyndell_erdtree": 5,
         "haligtree_malenia": 3,
@@ -186,14 +212,12 @@ stormveil_godrick = 1
     }
 
 
-def test_major_bosses_from_toml(tmp_path):
+def test_major_bosses_from_toml():
     """major_bosses is parsed from requirements section."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [requirements]
 major_bosses = 5
 """)
-    config = Config.from_toml(config_file)
     assert config.requirements.major_bosses == 5
 
 
@@ -305,17 +329,15 @@ def test_starting_items_defaults():
     assert config.starting_items.starting_runes == 0
 
 
-def test_starting_items_consumables(tmp_path):
+def test_starting_items_consumables():
     """StartingItemsConfig parses consumable starting resources."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [starting_items]
 talisman_pouches = 2
 golden_seeds = 5
 sacred_tears = 3
 starting_runes = 50000
 """)
-    config = Config.from_toml(config_file)
     assert config.starting_items.talisman_pouches == 2
     assert config.starting_items.golden_seeds == 5
     assert config.starting_items.sacred_tears == 3
@@ -483,6 +505,15 @@ def test_starting_items_validation_larval_tears():
         Config.from_dict({"starting_items": {"larval_tears": -1}})
 
 
+def test_starting_items_validation_reports_all_ranges():
+    """All out-of-range starting items are reported in one error."""
+    with pytest.raises(ValueError) as exc_info:
+        Config.from_dict({"starting_items": {"golden_seeds": 100, "larval_tears": -1}})
+    message = str(exc_info.value)
+    assert "golden_seeds must be 0-99, got 100" in message
+    assert "larval_tears must be 0-99, got -1" in message
+
+
 def test_starting_items_larval_tears_default():
     """Default larval_tears is 10."""
     config = Config.from_dict({})
@@ -501,54 +532,46 @@ def test_item_randomizer_defaults():
     assert config.item_randomizer.item_preset_path == ""
 
 
-def test_item_randomizer_from_toml(tmp_path):
+def test_item_randomizer_from_toml():
     """ItemRandomizerConfig parses from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [item_randomizer]
 enabled = false
 difficulty = 75
 remove_requirements = false
 auto_upgrade_weapons = false
 """)
-    config = Config.from_toml(config_file)
     assert config.item_randomizer.enabled is False
     assert config.item_randomizer.difficulty == 75
     assert config.item_randomizer.remove_requirements is False
     assert config.item_randomizer.auto_upgrade_weapons is False
 
 
-def test_item_randomizer_auto_equip_from_toml(tmp_path):
+def test_item_randomizer_auto_equip_from_toml():
     """auto_equip parses from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [item_randomizer]
 auto_equip = true
 """)
-    config = Config.from_toml(config_file)
     assert config.item_randomizer.auto_equip is True
 
 
-def test_item_randomizer_allcraft_from_toml(tmp_path):
+def test_item_randomizer_allcraft_from_toml():
     """allcraft parses from TOML (regression: was silently ignored)."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [item_randomizer]
 allcraft = false
 """)
-    config = Config.from_toml(config_file)
     assert config.item_randomizer.allcraft is False
 
 
-def test_item_randomizer_item_preset_from_toml(tmp_path):
+def test_item_randomizer_item_preset_from_toml():
     """item_preset and item_preset_path parse from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [item_randomizer]
 item_preset = false
 item_preset_path = "/custom/preset.yaml"
 """)
-    config = Config.from_toml(config_file)
     assert config.item_randomizer.item_preset is False
     assert config.item_randomizer.item_preset_path == "/custom/preset.yaml"
 
@@ -563,15 +586,13 @@ def test_item_randomizer_validation_difficulty():
         Config.from_dict({"item_randomizer": {"difficulty": -1}})
 
 
-def test_structure_start_tier_from_toml(tmp_path):
+def test_structure_start_tier_from_toml():
     """start_tier can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 start_tier = 5
 final_tier = 20
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.start_tier == 5
     assert config.structure.final_tier == 20
 
@@ -594,14 +615,12 @@ def test_structure_start_tier_validation():
         Config.from_dict({"structure": {"start_tier": 20, "final_tier": 10}})
 
 
-def test_structure_final_tier_from_toml(tmp_path):
+def test_structure_final_tier_from_toml():
     """final_tier can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 final_tier = 20
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.final_tier == 20
 
 
@@ -627,25 +646,29 @@ def test_structure_final_tier_type_validation():
         Config.from_dict({"structure": {"final_tier": 20.5}})
 
 
-def test_run_complete_message_from_toml(tmp_path):
+def test_structure_tier_range_error_precedes_later_type_error():
+    """A range error on an earlier tier is not lost to a later type error."""
+    with pytest.raises(ValueError, match="start_tier must be 1-28, got 0"):
+        Config.from_dict({"structure": {"start_tier": 0, "final_tier": 20.5}})
+    with pytest.raises(TypeError, match="start_tier must be int"):
+        Config.from_dict({"structure": {"start_tier": 1.5, "final_tier": 99}})
+
+
+def test_run_complete_message_from_toml():
     """run_complete_message can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [run]
 run_complete_message = "GG EZ"
 """)
-    config = Config.from_toml(config_file)
     assert config.run_complete_message == "GG EZ"
 
 
-def test_run_complete_message_list_from_toml(tmp_path):
+def test_run_complete_message_list_from_toml():
     """run_complete_message can be a list of strings in TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [run]
 run_complete_message = ["A", "B", "C"]
 """)
-    config = Config.from_toml(config_file)
     assert config.run_complete_message == ["A", "B", "C"]
 
 
@@ -714,15 +737,13 @@ def test_tier_curve_defaults():
     assert config.structure.tier_curve_exponent == 0.6
 
 
-def test_tier_curve_from_toml(tmp_path):
+def test_tier_curve_from_toml():
     """tier_curve settings can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 tier_curve = "power"
 tier_curve_exponent = 1.5
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.tier_curve == "power"
     assert config.structure.tier_curve_exponent == 1.5
 
@@ -741,25 +762,21 @@ def test_tier_curve_exponent_must_be_positive():
         Config.from_dict({"structure": {"tier_curve_exponent": -1.0}})
 
 
-def test_chapel_grace_from_toml(tmp_path):
+def test_chapel_grace_from_toml():
     """chapel_grace can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [run]
 chapel_grace = false
 """)
-    config = Config.from_toml(config_file)
     assert config.chapel_grace is False
 
 
-def test_sentry_torch_shop_from_toml(tmp_path):
+def test_sentry_torch_shop_from_toml():
     """sentry_torch_shop can be set from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [run]
 sentry_torch_shop = false
 """)
-    config = Config.from_toml(config_file)
     assert config.sentry_torch_shop is False
 
 
@@ -779,14 +796,12 @@ def test_enemy_config_dlc_bosses_from_dict():
     assert config.enemy.dlc_bosses is False
 
 
-def test_enemy_config_dlc_bosses_from_toml(tmp_path):
+def test_enemy_config_dlc_bosses_from_toml():
     """enemy.dlc_bosses parses from a TOML file."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [enemy]
 dlc_bosses = false
 """)
-    config = Config.from_toml(config_file)
     assert config.enemy.dlc_bosses is False
 
 
@@ -796,14 +811,12 @@ def test_enemy_config_from_dict():
     assert config.enemy.randomize_bosses == "all"
 
 
-def test_enemy_config_from_toml(tmp_path):
+def test_enemy_config_from_toml():
     """EnemyConfig parses from TOML file."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [enemy]
 randomize_bosses = "minor"
 """)
-    config = Config.from_toml(config_file)
     assert config.enemy.randomize_bosses == "minor"
 
 
@@ -894,15 +907,13 @@ def test_removed_structure_keys_emit_deprecation_warning(legacy_key):
         Config.from_dict({"structure": {legacy_key: 1}})
 
 
-def test_max_exits_entrances_from_toml(tmp_path):
+def test_max_exits_entrances_from_toml():
     """max_exits and max_entrances parse from TOML."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 max_exits = 4
 max_entrances = 2
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.max_exits == 4
     assert config.structure.max_entrances == 2
 
@@ -923,14 +934,12 @@ def test_max_weight_tolerance_default():
     assert config.structure.max_weight_tolerance == 3.0
 
 
-def test_max_weight_tolerance_from_toml(tmp_path):
+def test_max_weight_tolerance_from_toml():
     """max_weight_tolerance parsed from TOML (float accepted)."""
-    config_file = tmp_path / "config.toml"
-    config_file.write_text("""
+    config = Config.from_toml_str("""
 [structure]
 max_weight_tolerance = 2.5
 """)
-    config = Config.from_toml(config_file)
     assert config.structure.max_weight_tolerance == 2.5
 
 
@@ -1,7 +1,9 @@
 """Tests for DAG data structures."""
 
+import pytest
+
 from speedfog.clusters import ClusterData
-from speedfog.dag import Dag, DagEdge, DagNode, FogRef
+from speedfog.dag import Dag, DagEdge, DagNode, FogRef, fog_ref
 
 
 def make_cluster(
@@ -25,8 +27,16 @@ def make_cluster(
 
 
 def _f(fog_id: str, zone: str = "z") -> FogRef:
-    """Shorthand for creating FogRef in tests."""
-    return FogRef(fog_id, zone)
+    """Shorthand for the canonical FogRef in tests."""
+    return fog_ref(fog_id, zone)
+
+
+def test_fog_ref_returns_canonical_instance():
+    """fog_ref shares one FogRef per (fog_id, zone) pair."""
+    ref = fog_ref("fog_1", "z")
+    assert ref is fog_ref("fog_1", "z")
+    assert ref == FogRef("fog_1", "z")
+    assert ref is not fog_ref("fog_1", "other")
 
 
 # =============================================================================
@@ -122,6 +132,22 @@ class TestDagNode:
         node_set = {node1, node2, node1_dup}
         assert len(node_set) == 2  # n1 and n2, duplicate removed
 
+    def test_fog_lists_stored_as_tuples(self):
+        """DagNode and ClusterData coerce fog lists to tuples."""
+        cluster = make_cluster("c1")
+        node = DagNode(
+            id="n1",
+            cluster=cluster,
+            layer=0,
+            tier=1,
+            entry_fogs=[_f("x")],
+            exit_fogs=[_f("y")],
+        )
+        assert node.entry_fogs == (_f("x"),)
+        assert node.exit_fogs == (_f("y"),)
+        assert isinstance(cluster.entry_fogs, tuple)
+        assert isinstance(cluster.exit_fogs, tuple)
+
 
 # =============================================================================
 # DagEdge tests
@@ -235,6 +261,18 @@ class TestDagEdge:
         edge_set = {edge1, edge2, edge1_dup}
         assert len(edge_set) == 2
 
+    def test_fog_id_and_immutability(self):
+        """fog_id mirrors the exit fog and edges cannot be mutated."""
+        edge = DagEdge(
+            source_id="a",
+            target_id="b",
+            exit_fog=_f("fog_1", "zone_a"),
+            entry_fog=_f("fog_2", "zone_b"),
+        )
+        assert edge.fog_id == "fog_1"
+        with pytest.raises(AttributeError):
+            edge.exit_fog = _f("fog_3")  # type: ignore[misc]
+
 
 # =============================================================================
 # Dag basic operations tests
@@ -333,6 +371,70 @@ class TestDagBasicOperations:
 
         assert edges == []
 
+    def test_edge_lookups_preserve_insertion_order(self):
+        """Edge lookups return edges in the order they were added."""
+        dag = Dag(seed=42)
+        dag.add_edge("a", "c", _f("fog_1"), _f("fog_1"))
+        dag.add_edge("a", "b", _f("fog_2"), _f("fog_2"))
+        dag.add_edge("b", "c", _f("fog_3"), _f("fog_3"))
+
+        assert dag.get_outgoing_edges("a") == [dag.edges[0], dag.edges[1]]
+        assert dag.get_incoming_edges("c") == [dag.edges[0], dag.edges[2]]
+        assert list(dag.iter_outgoing_edges("a")) == dag.get_outgoing_edges("a")
+        assert list(dag.iter_incoming_edges("c")) == dag.get_incoming_edges("c")
+        assert list(dag.iter_outgoing_edges("missing")) == []
+
+    def test_degrees(self):
+        """Dag.out_degree/in_degree count edges without materializing them."""
+        dag = Dag(seed=42)
+        dag.add_edge("a", "b", _f("fog_1"), _f("fog_1"))
+        dag.add_edge("a", "c", _f("fog_2"), _f("fog_2"))
+        dag.add_edge("b", "c", _f("fog_3"), _f("fog_3"))
+
+        assert dag.out_degree("a") == 2
+        assert dag.in_degree("c") == 2
+        assert dag.in_degree("a") == 0
+        assert dag.out_degree("missing") == 0
+
+    def test_has_edge(self):
+        """Dag.has_edge is directional and uses the adjacency index."""
+        dag = Dag(seed=42)
+        dag.add_edge("a", "b", _f("fog_1"), _f("fog_1"))
+
+        assert dag.has_edge("a", "b")
+        assert not dag.has_edge("b", "a")
+        assert not dag.has_edge("missing", "b")
+
+    def test_bulk_add(self):
+        """bulk_add matches add_node/add_edge and indexes the new edges."""
+        cluster = make_cluster("c1")
+        nodes = [
+            DagNode(id=n, cluster=cluster, layer=0, tier=1, entry_fogs=[], exit_fogs=[])
+            for n in ("a", "b", "c")
+        ]
+        dag = Dag(seed=42)
+        dag.add_edge("a", "b", _f("fog_1"), _f("fog_1"))
+        dag.bulk_add(
+            nodes,
+            [
+                ("a", "c", _f("fog_2"), _f("fog_2")),
+                ("b", "c", _f("fog_3"), _f("fog_3")),
+            ],
+        )
+
+        assert list(dag.nodes) == ["a", "b", "c"]
+        assert len(dag.edges) == 3
+        assert dag.get_outgoing_edges("a") == [dag.edges[0], dag.edges[1]]
+        assert dag.get_incoming_edges("c") == [dag.edges[1], dag.edges[2]]
+
+    def test_edges_passed_to_constructor_are_indexed(self):
+        """Edges given at construction time are visible to edge lookups."""
+        edge = DagEdge("a", "b", _f("fog_1"), _f("fog_1"))
+        dag = Dag(seed=42, edges=[edge])
+
+        assert dag.get_outgoing_edges("a") == [edge]
+        assert dag.get_incoming_edges("b") == [edge]
+
 
 # =============================================================================
 # Statistics tests
@@ -426,6 +528,59 @@ class TestDagStatistics:
 
         assert dag.total_zones() == 0
 
+    def test_total_zones_after_node_replaced(self):
+        """Re-adding a node id drops the zones of the node it replaces."""
+        dag = Dag(seed=42)
+        dag.add_node(
+            DagNode(
+                id="n1",
+                cluster=make_cluster("c1", zones=["z1", "z2"]),
+                layer=0,
+                tier=1,
+            )
+        )
+        dag.add_node(
+            DagNode(id="n1", cluster=make_cluster("c2", zones=["z3"]), layer=0, tier=1)
+        )
+
+        assert dag.total_zones() == 1
+
+    def test_count_by_type_after_node_replaced(self):
+        """Re-adding a node id moves its count to the new cluster type."""
+        dag = Dag(seed=42)
+        dag.add_node(
+            DagNode(
+                id="n1",
+                cluster=make_cluster("c1", cluster_type="mini_dungeon"),
+                layer=0,
+                tier=1,
+            )
+        )
+        dag.add_node(
+            DagNode(
+                id="n1",
+                cluster=make_cluster("c2", cluster_type="boss_arena"),
+                layer=0,
+                tier=1,
+            )
+        )
+
+        assert dag.count_by_type("mini_dungeon") == 0
+        assert dag.count_by_type("boss_arena") == 1
+
+    def test_nodes_by_layer(self):
+        """nodes_by_layer groups nodes in ascending layer order."""
+        dag = Dag(seed=42)
+        for node_id, layer in (("end", 2), ("a", 1), ("start", 0), ("b", 1)):
+            dag.add_node(
+                DagNode(id=node_id, cluster=make_cluster(node_id), layer=layer, tier=1)
+            )
+
+        by_layer = dag.nodes_by_layer()
+
+        assert list(by_layer) == [0, 1, 2]
+        assert [n.id for n in by_layer[1]] == ["a", "b"]
+
     def test_count_by_type(self):
         """count_by_type returns count of nodes with matching cluster type."""
         dag = Dag(seed=42)
@@ -484,83 +639,37 @@ class TestDagStatistics:
 class TestDagValidation:
     """Tests for Dag.validate_structure."""
 
-    def test_validate_missing_start_id(self):
-        """validate_structure reports missing start_id."""
-        dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="a",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.end_id = "a"
-
-        errors = dag.validate_structure()
-
-        assert any("start" in e.lower() for e in errors)
-
-    def test_validate_missing_end_id(self):
-        """validate_structure reports missing end_id."""
+    @pytest.mark.parametrize(
+        ("start_id", "end_id", "expected"),
+        [
+            ("", "a", ("missing start_id",)),
+            ("a", "", ("missing end_id",)),
+            ("nonexistent", "a", ("start", "not found")),
+            ("a", "nonexistent", ("end", "not found")),
+        ],
+        ids=["missing_start_id", "missing_end_id", "start_missing", "end_missing"],
+    )
+    def test_validate_endpoints(self, start_id, end_id, expected):
+        """validate_structure reports unset or dangling start/end ids."""
         dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="a",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.start_id = "a"
+        dag.add_node(DagNode(id="a", cluster=make_cluster("c1"), layer=0, tier=1))
+        dag.start_id = start_id
+        dag.end_id = end_id
 
         errors = dag.validate_structure()
 
-        assert any("end" in e.lower() for e in errors)
+        assert any(all(word in e.lower() for word in expected) for e in errors)
 
-    def test_validate_start_node_missing(self):
-        """validate_structure reports when start_id references missing node."""
+    def test_validate_stops_after_missing_endpoint(self):
+        """Reachability is not checked when start or end is missing."""
         dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="a",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
+        for node_id in ("a", "b"):
+            dag.add_node(
+                DagNode(id=node_id, cluster=make_cluster(node_id), layer=0, tier=1)
             )
-        )
-        dag.start_id = "nonexistent"
         dag.end_id = "a"
 
-        errors = dag.validate_structure()
-
-        assert any("start" in e.lower() and "not found" in e.lower() for e in errors)
-
-    def test_validate_end_node_missing(self):
-        """validate_structure reports when end_id references missing node."""
-        dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="a",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.start_id = "a"
-        dag.end_id = "nonexistent"
-
-        errors = dag.validate_structure()
-
-        assert any("end" in e.lower() and "not found" in e.lower() for e in errors)
+        assert dag.validate_structure() == ["Missing start_id"]
 
     def test_validate_unreachable_nodes(self):
         """validate_structure reports nodes not reachable from start."""
@@ -645,6 +754,10 @@ class TestDagValidation:
 
         assert any("dead end" in e.lower() and "dead" in e for e in errors)
 
+        # Adding an edge invalidates the cached reachability sets
+        dag.add_edge("dead", "end", _f("fog_3"), _f("fog_3"))
+        assert dag.validate_structure() == []
+
     def test_validate_backward_edges(self):
         """validate_structure reports edges going to same or lower layer."""
         dag = Dag(seed=42)
@@ -796,63 +909,18 @@ class TestDagValidation:
 
         assert errors == []
 
-    def test_validate_edge_references_missing_source(self):
-        """validate_structure reports edges with missing source node."""
-        dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="start",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.add_node(
-            DagNode(
-                id="end",
-                cluster=make_cluster("c2"),
-                layer=1,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.add_edge("start", "end", _f("fog_1"), _f("fog_1"))
-        dag.add_edge("nonexistent", "end", _f("fog_2"), _f("fog_2"))  # Missing source
-        dag.start_id = "start"
-        dag.end_id = "end"
-
-        errors = dag.validate_structure()
-
-        assert any("nonexistent" in e for e in errors)
-
-    def test_validate_edge_references_missing_target(self):
-        """validate_structure reports edges with missing target node."""
+    @pytest.mark.parametrize(
+        ("source_id", "target_id"),
+        [("nonexistent", "end"), ("start", "nonexistent")],
+        ids=["missing_source", "missing_target"],
+    )
+    def test_validate_edge_references_missing_node(self, source_id, target_id):
+        """validate_structure reports edges whose source or target is missing."""
         dag = Dag(seed=42)
-        dag.add_node(
-            DagNode(
-                id="start",
-                cluster=make_cluster("c1"),
-                layer=0,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
-        dag.add_node(
-            DagNode(
-                id="end",
-                cluster=make_cluster("c2"),
-                layer=1,
-                tier=1,
-                entry_fogs=[],
-                exit_fogs=[],
-            )
-        )
+        dag.add_node(DagNode(id="start", cluster=make_cluster("c1"), layer=0, tier=1))
+        dag.add_node(DagNode(id="end", cluster=make_cluster("c2"), layer=1, tier=1))
         dag.add_edge("start", "end", _f("fog_1"), _f("fog_1"))
-        dag.add_edge("start", "nonexistent", _f("fog_2"), _f("fog_2"))  # Missing target
+        dag.add_edge(source_id, target_id, _f("fog_2"), _f("fog_2"))
         dag.start_id = "start"
         dag.end_id = "end"
 
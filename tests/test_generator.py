@@ -1,12 +1,18 @@
 """Tests for DAG generation logic."""
 
+import functools
+import itertools
 import random
+import statistics
+import zlib
+from collections import Counter
 from pathlib import Path
 
 import pytest
 
 from speedfog.clusters import ClusterData, ClusterPool, fog_matches_spec, load_clusters
 from speedfog.config import Config, RequirementsConfig, StructureConfig
+from speedfog.dag import Dag
 from speedfog.generator import (
     GenerationError,
     _filter_exits_by_proximity,
@@ -27,21 +33,39 @@ from speedfog.generator import (
 _SENTINEL = object()
 
 
+_REAL_CLUSTERS_PATH = Path(__file__).parent.parent / "data" / "clusters.json"
+
+
 def load_real_clusters() -> ClusterPool:
     """Load the real data/clusters.json with standard preprocessing.
 
     Skips the test when the file is absent (it is generated by bootstrap
-    and not tracked), matching the fixture in test_integration.py.
+    and not tracked), matching the fixture in test_integration.py. The pool
+    is parsed once per session; callers must only read it.
     """
-    clusters_path = Path(__file__).parent.parent / "data" / "clusters.json"
-    if not clusters_path.exists():
+    if not _REAL_CLUSTERS_PATH.exists():
         pytest.skip("clusters.json not found")
-    pool = load_clusters(clusters_path)
+    return _load_real_clusters_once()
+
+
+@functools.cache
+def _load_real_clusters_once() -> ClusterPool:
+    pool = load_clusters(_REAL_CLUSTERS_PATH)
     pool.merge_roundtable_into_start()
     pool.filter_passant_incompatible()
     return pool
 
 
+@functools.cache
+def _default_fogs(cluster_id: str, kind: str) -> tuple[dict, ...]:
+    """Default one-fog entry/exit list for make_cluster, shared per cluster id.
+
+    The fog dicts are never mutated, so every cluster built with the same id
+    can reuse them.
+    """
+    return ({"fog_id": f"{cluster_id}_{kind}", "zone": cluster_id},)
+
+
 def make_cluster(
     cluster_id: str,
     zones: list[str] | None = None,
@@ -57,9 +81,9 @@ def make_cluster(
     Uses sentinel value to distinguish between explicit [] and no argument.
     """
     if entry_fogs is _SENTINEL:
-        entry_fogs = [{"fog_id": f"{cluster_id}_entry", "zone": cluster_id}]
+        entry_fogs = _default_fogs(cluster_id, "entry")
     if exit_fogs is _SENTINEL:
-        exit_fogs = [{"fog_id": f"{cluster_id}_exit", "zone": cluster_id}]
+        exit_fogs = _default_fogs(cluster_id, "exit")
     return ClusterData(
         id=cluster_id,
         zones=zones or [f"{cluster_id}_zone"],
@@ -188,6 +212,47 @@ def make_cluster_pool() -> ClusterPool:
     return pool
 
 
+@functools.cache
+def _read_only_pool() -> ClusterPool:
+    return make_cluster_pool()
+
+
+@pytest.fixture(scope="session")
+def shared_pool() -> ClusterPool:
+    """One make_cluster_pool() shared by tests that only read the pool.
+
+    Tests that add, remove, filter or merge clusters must build their own
+    pool with make_cluster_pool() instead.
+    """
+    return _read_only_pool()
+
+
+@pytest.fixture(scope="session")
+def _shared_random() -> random.Random:
+    return random.Random()
+
+
+@pytest.fixture
+def rng(_shared_random) -> random.Random:
+    """A Random reseeded to 42 for each test.
+
+    The instance is shared across the session, so tests that loop over
+    seeds call rng.seed(seed) instead of building a new Random each time.
+    """
+    _shared_random.seed(42)
+    return _shared_random
+
+
+@pytest.fixture
+def seed(request) -> int:
+    """A non-zero seed derived from the test name.
+
+    Stable across runs (crc32, not the salted str hash) but distinct per
+    test, so tests sharing a pool and config still draw different streams.
+    """
+    return zlib.crc32(request.node.name.encode()) & 0x7FFFFFFF or 1
+
+
 def _make_test_config(seed: int = 42, *, layers_count: int = 6) -> Config:
     """Return a Config pointing at the test_final_boss_zone with small layers_count.
 
@@ -212,6 +277,57 @@ def _boss_candidates(pool: ClusterPool) -> list:
     return pool.get_by_type("major_boss") + pool.get_by_type("final_boss")
 
 
+def _pool_without_start() -> tuple[ClusterPool, Config]:
+    """Return a (pool, config) pair whose pool has no start cluster.
+
+    The pool holds a single dead-end major_boss; the config targets it and
+    zeroes every requirement, so generation fails on the missing start alone.
+    """
+    pool = ClusterPool()
+    pool.add(
+        make_cluster(
+            "some_boss",
+            zones=["some_zone"],
+            cluster_type="major_boss",
+            entry_fogs=[{"fog_id": "e", "zone": "some_zone"}],
+            exit_fogs=[],
+        )
+    )
+    config = Config()
+    config.structure.final_boss_candidates = {"some_zone": 1}
+    config.structure.layers_count = 4
+    config.requirements.legacy_dungeons = 0
+    config.requirements.bosses = 0
+    config.requirements.mini_dungeons = 0
+    config.requirements.major_bosses = 0
+    return pool, config
+
+
+@functools.cache
+def _cached_default_dag(seed: int) -> Dag:
+    """generate_dag(_make_test_config(seed), shared pool), once per seed.
+
+    generate_dag is deterministic for a given pool, config and seed, so
+    tests that only inspect the result can share it. Callers must not
+    mutate the returned DAG.
+    """
+    pool = _read_only_pool()
+    dag, _log = generate_dag(
+        _make_test_config(seed), pool, boss_candidates=_boss_candidates(pool)
+    )
+    return dag
+
+
+@pytest.fixture
+def default_dag() -> Dag:
+    """DAG generated from _make_test_config() for structure-only checks.
+
+    Tests must not mutate it; tests that need a different config or seed
+    call generate_dag themselves.
+    """
+    return _cached_default_dag(42)
+
+
 # =============================================================================
 # generate_dag tests
 # =============================================================================
@@ -220,96 +336,75 @@ def _boss_candidates(pool: ClusterPool) -> list:
 class TestGenerateDag:
     """Tests for generate_dag (exit-driven implementation)."""
 
-    def test_generates_dag_with_fixed_seed(self):
+    def test_generates_dag_with_fixed_seed(self, shared_pool, seed):
         """Generates a DAG reproducibly with a fixed seed."""
-        pool = make_cluster_pool()
-        config = _make_test_config(seed=12345)
+        pool = shared_pool
+        config = _make_test_config(seed=seed)
 
         dag1, _log1 = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
         dag2, _log2 = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
 
-        assert dag1.seed == dag2.seed == 12345
+        assert dag1.seed == dag2.seed == seed
         assert len(dag1.nodes) == len(dag2.nodes)
         assert set(dag1.nodes.keys()) == set(dag2.nodes.keys())
 
-    def test_has_start_and_end_nodes(self):
+    def test_has_start_and_end_nodes(self, default_dag):
         """Generated DAG has start and end nodes."""
-        pool = make_cluster_pool()
-        config = _make_test_config()
-
-        dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
-
+        dag = default_dag
         assert dag.start_id is not None
         assert dag.end_id is not None
         assert dag.start_id in dag.nodes
         assert dag.end_id in dag.nodes
 
-    def test_end_is_final_boss(self):
+    def test_end_is_final_boss(self, default_dag):
         """The end node uses the chosen final boss cluster."""
-        pool = make_cluster_pool()
-        config = _make_test_config()
-
-        dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
-
+        dag = default_dag
         end_node = dag.nodes[dag.end_id]
         assert "test_final_boss_zone" in end_node.cluster.zones
 
-    def test_all_paths_reach_end(self):
+    def test_all_paths_reach_end(self, default_dag):
         """All paths in the DAG lead from start to end."""
-        pool = make_cluster_pool()
-        config = _make_test_config()
-
-        dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
-
+        dag = default_dag
+        # O(V + E) reachability in both directions; no path enumeration
         errors = dag.validate_structure()
         assert not errors, f"DAG structure errors: {errors}"
+        # Only end is a sink and only start is a source
+        sinks = [n for n in dag.nodes if dag.out_degree(n) == 0]
+        sources = [n for n in dag.nodes if dag.in_degree(n) == 0]
+        assert sinks == [dag.end_id]
+        assert sources == [dag.start_id]
 
-    def test_respects_max_parallel_paths(self):
+    def test_respects_max_parallel_paths(self, shared_pool, seed):
         """DAG does not exceed max_parallel_paths at any layer."""
-        pool = make_cluster_pool()
-        config = _make_test_config(layers_count=8)
+        pool = shared_pool
+        config = _make_test_config(seed, layers_count=8)
         config.structure.max_parallel_paths = 2
 
         dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
 
-        nodes_by_layer: dict[int, int] = {}
+        # Layers are small consecutive ints: index a list instead of hashing
+        widths = [0] * (max(node.layer for node in dag.nodes.values()) + 1)
         for node in dag.nodes.values():
-            layer = node.layer
-            nodes_by_layer[layer] = nodes_by_layer.get(layer, 0) + 1
+            widths[node.layer] += 1
 
-        for layer, count in nodes_by_layer.items():
-            assert (
-                count <= config.structure.max_parallel_paths
-            ), f"Layer {layer} has {count} nodes > max_parallel_paths"
+        assert max(widths) <= config.structure.max_parallel_paths, (
+            f"Layer widths {widths} exceed max_parallel_paths"
+        )
 
-    def test_no_zone_overlap(self):
+    def test_no_zone_overlap(self, default_dag):
         """Each zone appears in exactly one node."""
-        pool = make_cluster_pool()
-        config = _make_test_config()
-
-        dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
-
-        all_zones: set[str] = set()
-        for node in dag.nodes.values():
-            for zone in node.cluster.zones:
-                assert zone not in all_zones, f"Zone {zone} appears multiple times"
-                all_zones.add(zone)
+        dag = default_dag
+        all_zones = [z for node in dag.nodes.values() for z in node.cluster.zones]
+        # The message (and its Counter) is only built if the assert fails
+        assert len(set(all_zones)) == len(all_zones), (
+            f"Zones appear multiple times: "
+            f"{sorted(z for z, n in Counter(all_zones).items() if n > 1)}"
+        )
 
     def test_raises_if_no_start_cluster(self):
         """Raises GenerationError if no start cluster exists."""
-        pool = ClusterPool()
-        pool.add(
-            make_cluster(
-                "some_boss",
-                zones=["some_zone"],
-                cluster_type="major_boss",
-                entry_fogs=[{"fog_id": "e", "zone": "some_zone"}],
-                exit_fogs=[],
-            )
-        )
-        config = Config(seed=42)
-        config.structure.final_boss_candidates = {"some_zone": 1}
-        config.structure.layers_count = 4
+        pool, config = _pool_without_start()
+        config.seed = 42
 
         with pytest.raises(GenerationError, match="[Ss]tart"):
             generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
@@ -418,29 +513,19 @@ class TestGenerateDag:
         assert end_node.cluster.type == "final_boss"
         assert "leyndell_erdtree" in end_node.cluster.zones
 
-    def test_layer_tiers_increase(self):
+    def test_layer_tiers_increase(self, shared_pool, seed):
         """Difficulty tier (weakly) increases with layer index."""
-        pool = make_cluster_pool()
-        config = _make_test_config(layers_count=8)
+        pool = shared_pool
+        config = _make_test_config(seed, layers_count=8)
 
         dag, _log = generate_dag(config, pool, boss_candidates=_boss_candidates(pool))
 
-        tiers_by_layer: dict[int, list[int]] = {}
-        for node in dag.nodes.values():
-            layer = node.layer
-            if layer not in tiers_by_layer:
-                tiers_by_layer[layer] = []
-            tiers_by_layer[layer].append(node.tier)
-
-        layers = sorted(tiers_by_layer.keys())
-        for i in range(len(layers) - 1):
-            avg_current = sum(tiers_by_layer[layers[i]]) / len(
-                tiers_by_layer[layers[i]]
-            )
-            avg_next = sum(tiers_by_layer[layers[i + 1]]) / len(
-                tiers_by_layer[layers[i + 1]]
-            )
-            assert avg_next >= avg_current
+        # nodes_by_layer() is in ascending layer order
+        avg_tiers = [
+            statistics.fmean(node.tier for node in nodes)
+            for nodes in dag.nodes_by_layer().values()
+        ]
+        assert all(b >= a for a, b in itertools.pairwise(avg_tiers)), avg_tiers
 
 
 # =============================================================================
@@ -451,23 +536,23 @@ class TestGenerateDag:
 class TestGenerateWithRetry:
     """Tests for generate_with_retry (exit-driven implementation)."""
 
-    def test_fixed_seed_single_attempt(self):
+    def test_fixed_seed_single_attempt(self, shared_pool, seed):
         """With non-zero seed, uses that seed directly (single attempt)."""
-        pool = make_cluster_pool()
-        config = _make_test_config(seed=99999)
+        pool = shared_pool
+        config = _make_test_config(seed=seed)
 
         result = generate_with_retry(
             config, pool, boss_candidates=_boss_candidates(pool)
         )
 
-        assert result.seed == 99999
-        assert result.dag.seed == 99999
+        assert result.seed == seed
+        assert result.dag.seed == seed
         assert result.attempts == 1
         assert result.validation.is_valid
 
-    def test_auto_reroll_finds_valid_seed(self):
+    def test_auto_reroll_finds_valid_seed(self, shared_pool):
         """With seed=0, tries random seeds until success."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = _make_test_config(seed=0)
 
         result = generate_with_retry(
@@ -498,58 +583,40 @@ class TestGenerateWithRetry:
         end_node = result.dag.nodes[result.dag.end_id]
         assert "test_final_boss_zone" in end_node.cluster.zones
 
-    def test_raises_after_max_attempts(self):
-        """Raises GenerationError after max_attempts failures (no start cluster)."""
-        pool = ClusterPool()
-        pool.add(
-            make_cluster(
-                "some_boss",
-                zones=["some_zone"],
-                cluster_type="major_boss",
-                entry_fogs=[{"fog_id": "e", "zone": "some_zone"}],
-                exit_fogs=[],
-            )
-        )
-        config = Config(seed=0)
-        config.structure.final_boss_candidates = {"some_zone": 1}
-        config.structure.layers_count = 4
-        config.requirements.legacy_dungeons = 0
-        config.requirements.bosses = 0
-        config.requirements.mini_dungeons = 0
-        config.requirements.major_bosses = 0
+    @pytest.mark.parametrize(
+        ("seed", "match"),
+        [(0, "after.*attempts"), (42, None)],
+        ids=["auto_reroll_exhausts_attempts", "fixed_seed_propagates"],
+    )
+    def test_raises_without_start_cluster(self, seed, match):
+        """Auto-reroll gives up after max_attempts; a fixed seed fails at once."""
+        pool, config = _pool_without_start()
+        config.seed = seed
 
-        with pytest.raises(GenerationError, match="after.*attempts"):
+        with pytest.raises(GenerationError, match=match):
             generate_with_retry(
                 config, pool, max_attempts=5, boss_candidates=_boss_candidates(pool)
             )
 
-    def test_fixed_seed_propagates_error(self):
-        """With fixed seed that fails, propagates the error."""
-        pool = ClusterPool()
-        pool.add(
-            make_cluster(
-                "some_boss",
-                zones=["some_zone"],
-                cluster_type="major_boss",
-                entry_fogs=[{"fog_id": "e", "zone": "some_zone"}],
-                exit_fogs=[],
-            )
-        )
-        config = Config(seed=42)
-        config.structure.final_boss_candidates = {"some_zone": 1}
-        config.structure.layers_count = 4
-        config.requirements.legacy_dungeons = 0
-        config.requirements.bosses = 0
-        config.requirements.mini_dungeons = 0
-        config.requirements.major_bosses = 0
+    @pytest.mark.parametrize("max_attempts", [0, -1])
+    def test_non_positive_max_attempts_raises_generation_error(
+        self, shared_pool, max_attempts
+    ):
+        """Auto-reroll with no attempts to spend fails with GenerationError."""
+        config = _make_test_config(seed=0)
 
-        with pytest.raises(GenerationError):
-            generate_with_retry(config, pool, boss_candidates=_boss_candidates(pool))
+        with pytest.raises(GenerationError, match="after.*attempts"):
+            generate_with_retry(
+                config,
+                shared_pool,
+                max_attempts=max_attempts,
+                boss_candidates=_boss_candidates(shared_pool),
+            )
 
-    def test_post_validate_triggers_retry_in_auto_mode(self):
+    def test_post_validate_triggers_retry_in_auto_mode(self, shared_pool):
         """post_validate rejecting the first N seeds forces the loop to keep
         rerolling, and the accepted (dag, seed) is what the hook last saw."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = _make_test_config(seed=0)
 
         seen: list[tuple[object, int]] = []
@@ -569,16 +636,18 @@ class TestGenerateWithRetry:
 
         assert len(seen) == 3
         assert result.attempts == 3
+        # Attempt seeds are drawn without replacement
+        assert len({seed for _dag, seed in seen}) == 3
         # The returned DAG/seed must match the last (dag, seed) the hook
         # accepted, not an earlier rejected one.
         last_dag, last_seed = seen[-1]
         assert result.seed == last_seed
         assert result.dag is last_dag
 
-    def test_post_validate_fixed_seed_propagates(self):
+    def test_post_validate_fixed_seed_propagates(self, shared_pool):
         """post_validate failing under a fixed seed surfaces the error instead
         of silently passing."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = _make_test_config(seed=99999)
 
         def post_validate(dag, seed):
@@ -608,93 +677,76 @@ class TestValidateConfig:
         cfg.requirements.major_bosses = 0
         return cfg
 
-    def test_valid_config_returns_empty_list(self):
+    def test_valid_config_returns_empty_list(self, shared_pool):
         """Valid configuration returns no errors."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = self._cfg()
         errors, _ = validate_config(config, pool, _boss_candidates(pool))
         assert errors == []
 
-    def test_invalid_first_layer_type(self):
-        """Invalid first_layer_type returns error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.structure.first_layer_type = "invalid_type"
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert len(errors) == 1
-        assert "first_layer_type" in errors[0]
-        assert "invalid_type" in errors[0]
-
-    def test_valid_first_layer_type(self):
-        """Valid first_layer_type returns no error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.structure.first_layer_type = "legacy_dungeon"
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert errors == []
-
-    def test_major_bosses_negative_validation(self):
-        """Negative major_bosses returns error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.requirements.major_bosses = -1
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert len(errors) == 1
-        assert "major_bosses" in errors[0]
-
-    def test_major_bosses_zero_valid(self):
-        """major_bosses=0 is valid (no major bosses)."""
-        pool = make_cluster_pool()
+    @pytest.mark.parametrize(
+        ("section", "field", "value", "expected"),
+        [
+            (
+                "structure",
+                "first_layer_type",
+                "invalid_type",
+                ("first_layer_type", "invalid_type"),
+            ),
+            ("structure", "first_layer_type", "legacy_dungeon", None),
+            ("requirements", "major_bosses", -1, ("major_bosses",)),
+            ("requirements", "major_bosses", 0, None),
+            (
+                "structure",
+                "final_boss_candidates",
+                {"nonexistent_zone": 1},
+                ("nonexistent_zone",),
+            ),
+            ("structure", "final_boss_candidates", {"test_final_boss_zone": 1}, None),
+            ("structure", "final_boss_candidates", {"all": 1}, None),
+            (
+                "structure",
+                "final_boss_candidates",
+                {"test_final_boss_zone": 0},
+                ("invalid weight",),
+            ),
+        ],
+        ids=[
+            "invalid_first_layer_type",
+            "valid_first_layer_type",
+            "negative_major_bosses",
+            "zero_major_bosses",
+            "unknown_final_boss_candidate",
+            "valid_final_boss_candidate",
+            "final_boss_candidates_all_keyword",
+            "invalid_final_boss_weight",
+        ],
+    )
+    def test_single_field(self, shared_pool, section, field, value, expected):
+        """One field set on a valid config yields one matching error, or none."""
+        pool = shared_pool
         config = self._cfg()
+        setattr(getattr(config, section), field, value)
         errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert errors == []
-
-    def test_major_bosses_positive_valid(self):
+        if expected is None:
+            assert errors == []
+        else:
+            assert len(errors) == 1
+            for substr in expected:
+                assert substr in errors[0]
+
+    def test_major_bosses_positive_valid(self, shared_pool):
         """Positive major_bosses is valid."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = self._cfg()
         config.requirements.major_bosses = 8
         config.structure.layers_count = 50
         errors, _ = validate_config(config, pool, _boss_candidates(pool))
         assert errors == []
 
-    def test_unknown_final_boss_candidate(self):
-        """Unknown zone in final_boss_candidates returns error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.structure.final_boss_candidates = {"nonexistent_zone": 1}
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert len(errors) == 1
-        assert "nonexistent_zone" in errors[0]
-
-    def test_valid_final_boss_candidate(self):
-        """Valid zone in final_boss_candidates returns no error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        # test_final_boss_zone exists in the fixture (already set by _cfg)
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert errors == []
-
-    def test_final_boss_candidates_all_keyword(self):
-        """'all' keyword in final_boss_candidates is valid."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.structure.final_boss_candidates = {"all": 1}
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert errors == []
-
-    def test_invalid_weight_returns_error(self):
-        """Weight < 1 in final_boss_candidates returns error."""
-        pool = make_cluster_pool()
-        config = self._cfg()
-        config.structure.final_boss_candidates = {"test_final_boss_zone": 0}
-        errors, _ = validate_config(config, pool, _boss_candidates(pool))
-        assert len(errors) == 1
-        assert "invalid weight" in errors[0]
-
-    def test_multiple_errors_returned(self):
+    def test_multiple_errors_returned(self, shared_pool):
         """Multiple config errors are all returned."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = self._cfg()
         config.structure.first_layer_type = "bad_type"
         config.requirements.major_bosses = -1
@@ -702,9 +754,9 @@ class TestValidateConfig:
         errors, _ = validate_config(config, pool, _boss_candidates(pool))
         assert len(errors) == 3
 
-    def test_requirements_within_layers_no_warning(self):
+    def test_requirements_within_layers_no_warning(self, shared_pool):
         """No warning when requirements fit within layers_count."""
-        pool = make_cluster_pool()
+        pool = shared_pool
         config = self._cfg()
         config.requirements.legacy_dungeons = 1
         config.requirements.bosses = 2
@@ -829,7 +881,7 @@ class TestSelectWeightedFinalBoss:
             exit_fogs=[],
         )
 
-    def test_weighted_distribution(self):
+    def test_weighted_distribution(self, rng):
         """Higher weight produces proportionally more selections."""
         boss_a = self._make_boss_cluster("boss_a")
         boss_b = self._make_boss_cluster("boss_b")
@@ -838,7 +890,7 @@ class TestSelectWeightedFinalBoss:
 
         counts: dict[str, int] = {"boss_a": 0, "boss_b": 0}
         for seed in range(1000):
-            rng = random.Random(seed)
+            rng.seed(seed)
             result = select_weighted_final_boss(candidates, clusters, set(), rng)
             counts[result.zones[0]] += 1
 
@@ -1065,6 +1117,23 @@ class TestCanBePassantNodeEntryAsExit:
 
         assert can_be_passant_node(cluster) is False
 
+    def test_net_exits_memo_reset_on_fog_change(self):
+        """The memoized single-entry net exit count follows fog changes."""
+        cluster = make_cluster(
+            "boss",
+            cluster_type="boss_arena",
+            entry_fogs=[{"fog_id": "boss_entry", "zone": "boss"}],
+            exit_fogs=[{"fog_id": "boss_entry", "zone": "boss"}],
+        )
+
+        assert can_be_passant_node(cluster) is False
+        assert cluster.single_entry_net_exits == 0
+
+        cluster.exit_fogs += ({"fog_id": "boss_exit", "zone": "boss"},)
+        cluster.refresh_fog_keys()
+        assert cluster.single_entry_net_exits is None
+        assert can_be_passant_node(cluster) is True
+
 
 class TestCanBeMergeNode:
     """Tests for can_be_merge_node."""
@@ -1210,6 +1279,7 @@ class TestMergeRoundtableIntoStart:
         start = pool.get_by_type("start")[0]
         assert "roundtable" in start.zones
         assert "chapel_start" in start.zones
+        assert start.zone_set == frozenset(start.zones)
 
     def test_merges_exit_fogs(self):
         """Start cluster gains roundtable exit fog after merge."""
@@ -1220,6 +1290,7 @@ class TestMergeRoundtableIntoStart:
         exit_fog_ids = [f["fog_id"] for f in start.exit_fogs]
         assert "AEG099_001_9000" in exit_fog_ids
         assert "AEG099_231_9000" in exit_fog_ids
+        assert ("AEG099_231_9000", "roundtable") in start.exit_keys
 
     def test_merges_entry_fogs(self):
         """Start cluster gains roundtable entry fog after merge."""
@@ -1239,6 +1310,7 @@ class TestMergeRoundtableIntoStart:
 
         assert pool.get_by_id("roundtable_dacf") is None
         assert all("roundtable" not in c.zones for c in pool.get_by_type("other"))
+        assert all(c.id != "roundtable_dacf" for c in pool.clusters)
 
     def test_noop_without_roundtable(self):
         """Merge is a no-op when there is no roundtable cluster."""
@@ -1373,25 +1445,26 @@ class TestFilterPassantIncompatible:
 class TestPickClusterUniform:
     """Tests for pick_cluster_uniform."""
 
-    def test_picks_from_available(self):
+    def test_picks_from_available(self, rng):
         """Picks a cluster with no zone overlap."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z2"])
-        result = pick_cluster_uniform([c1, c2], {"z1"}, random.Random(42))
+        result = pick_cluster_uniform([c1, c2], {"z1"}, rng)
         assert result is c2
 
-    def test_returns_none_when_all_used(self):
+    def test_returns_none_when_all_used(self, rng):
         """Returns None when all zones overlap."""
         c1 = make_cluster("c1", zones=["z1"])
-        result = pick_cluster_uniform([c1], {"z1"}, random.Random(42))
+        result = pick_cluster_uniform([c1], {"z1"}, rng)
         assert result is None
 
-    def test_uniform_distribution(self):
+    def test_uniform_distribution(self, rng):
         """Selection is approximately uniform."""
         clusters = [make_cluster(f"c{i}", zones=[f"z{i}"]) for i in range(3)]
         counts = {c.id: 0 for c in clusters}
         for seed in range(3000):
-            picked = pick_cluster_uniform(clusters, set(), random.Random(seed))
+            rng.seed(seed)
+            picked = pick_cluster_uniform(clusters, set(), rng)
             counts[picked.id] += 1
         # Each should be roughly 1000 +/- 200
         for count in counts.values():
@@ -1401,7 +1474,7 @@ class TestPickClusterUniform:
 class TestPickClusterUniformReservedZones:
     """Tests for reserved_zones parameter in pick_cluster_uniform."""
 
-    def test_reserved_zones_excluded(self):
+    def test_reserved_zones_excluded(self, rng):
         """Clusters with reserved zones are not picked."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z2"])
@@ -1409,17 +1482,18 @@ class TestPickClusterUniformReservedZones:
         candidates = [c1, c2, c3]
 
         # Reserve z2 — c2 should never be picked
-        for _ in range(100):
+        for seed in range(100):
+            rng.seed(seed)
             result = pick_cluster_uniform(
                 candidates,
                 set(),
-                random.Random(_),
+                rng,
                 reserved_zones=frozenset(["z2"]),
             )
             assert result is not None
             assert result.id != "c2"
 
-    def test_reserved_and_used_both_excluded(self):
+    def test_reserved_and_used_both_excluded(self, rng):
         """Both used_zones and reserved_zones are excluded."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z2"])
@@ -1429,13 +1503,13 @@ class TestPickClusterUniformReservedZones:
         result = pick_cluster_uniform(
             candidates,
             {"z1"},
-            random.Random(42),
+            rng,
             reserved_zones=frozenset(["z2"]),
         )
         assert result is not None
         assert result.id == "c3"
 
-    def test_all_reserved_returns_none(self):
+    def test_all_reserved_returns_none(self, rng):
         """Returns None when all clusters have reserved zones."""
         c1 = make_cluster("c1", zones=["z1"])
         candidates = [c1]
@@ -1443,7 +1517,7 @@ class TestPickClusterUniformReservedZones:
         result = pick_cluster_uniform(
             candidates,
             set(),
-            random.Random(42),
+            rng,
             reserved_zones=frozenset(["z1"]),
         )
         assert result is None
@@ -1452,70 +1526,74 @@ class TestPickClusterUniformReservedZones:
 class TestPickClusterUniformRequiredZones:
     """Tests for required_zones parameter in pick_cluster_uniform."""
 
-    def test_restricts_to_candidates_with_required_zone(self):
+    def test_restricts_to_candidates_with_required_zone(self, rng):
         """When any candidate has a required zone, only those are eligible."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z_required"])
         c3 = make_cluster("c3", zones=["z3"])
         # Run many seeds: c2 must always be picked.
         for seed in range(50):
+            rng.seed(seed)
             result = pick_cluster_uniform(
                 [c1, c2, c3],
                 set(),
-                random.Random(seed),
+                rng,
                 required_zones=frozenset({"z_required"}),
             )
             assert result is c2
 
-    def test_no_required_match_uses_full_candidate_pool(self):
+    def test_no_required_match_uses_full_candidate_pool(self, rng):
         """When no candidate has a required zone, behavior is unchanged."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z2"])
         seen = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_uniform(
                 [c1, c2],
                 set(),
-                random.Random(seed),
+                rng,
                 required_zones=frozenset({"z_unmatched"}),
             )
             seen.add(r.id)
         assert seen == {"c1", "c2"}
 
-    def test_multiple_required_candidates_restricts_to_subset(self):
+    def test_multiple_required_candidates_restricts_to_subset(self, rng):
         """Multiple required candidates: draw uniform over the required subset."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z_req_a"])
         c3 = make_cluster("c3", zones=["z_req_b"])
         seen = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_uniform(
                 [c1, c2, c3],
                 set(),
-                random.Random(seed),
+                rng,
                 required_zones=frozenset({"z_req_a", "z_req_b"}),
             )
             seen.add(r.id)
         assert seen == {"c2", "c3"}  # c1 never selected
 
-    def test_default_required_zones_is_empty(self):
+    def test_default_required_zones_is_empty(self, rng):
         """Absent required_zones keyword: behavior unchanged."""
         c1 = make_cluster("c1", zones=["z1"])
         c2 = make_cluster("c2", zones=["z2"])
         seen = set()
         for seed in range(50):
-            r = pick_cluster_uniform([c1, c2], set(), random.Random(seed))
+            rng.seed(seed)
+            r = pick_cluster_uniform([c1, c2], set(), rng)
             seen.add(r.id)
         assert seen == {"c1", "c2"}
 
-    def test_required_zone_excluded_by_reserved_falls_back_to_full_pool(self):
+    def test_required_zone_excluded_by_reserved_falls_back_to_full_pool(self, rng):
         """If the only required candidate is reserved, the full pool is used."""
         c_req = make_cluster("c_req", zones=["z_required"])
         c_other = make_cluster("c_other", zones=["z_other"])
         result = pick_cluster_uniform(
             [c_req, c_other],
             set(),
-            random.Random(42),
+            rng,
             reserved_zones=frozenset({"z_required"}),
             required_zones=frozenset({"z_required"}),
         )
@@ -1575,6 +1653,10 @@ class TestFilterExitsByProximity:
         result = _filter_exits_by_proximity(cluster, entry, cluster.exit_fogs)
         assert len(result) == 1
         assert result[0]["fog_id"] == "fog_C"
+        # The blocked specs are memoized on the cluster per entry
+        assert cluster.proximity_blocked == {
+            ("fog_A", "z"): frozenset({"fog_A", "fog_B"})
+        }
 
     def test_entry_not_in_any_group(self):
         cluster = make_cluster(
@@ -1684,6 +1766,25 @@ class TestProximityGroups:
         # With 2 entries: e1 blocks x1, e2 blocks x2, only x3 survives
         assert count_net_exits(cluster, 2) == 1
 
+    def test_count_net_exits_interchangeable_entries(self):
+        """Entries removing the same exits are checked once, not per combination.
+
+        C(31, 10) entry combinations would take minutes to enumerate; the
+        30 ungrouped entries all remove nothing, so only two cases remain.
+        """
+        cluster = make_cluster(
+            "c1",
+            entry_fogs=[{"fog_id": "e0", "zone": "z"}]
+            + [{"fog_id": f"free{i}", "zone": "z"} for i in range(30)],
+            exit_fogs=[
+                {"fog_id": "x1", "zone": "z"},
+                {"fog_id": "x2", "zone": "z"},
+            ],
+            proximity_groups=[["e0", "x1"]],
+        )
+        assert count_net_exits(cluster, 10) == 1
+        assert count_net_exits(cluster, 31) == 1
+
     def test_count_net_exits_not_capped_by_exit_group(self):
         """Exits sharing a proximity group are NOT mutually exclusive: only the
         entry-vs-exit constraint applies, so all three exits stay usable."""
@@ -1860,7 +1961,7 @@ class TestAllowedEntriesExits:
 class TestZoneConflicts:
     """Tests for zone conflict exclusion during DAG generation."""
 
-    def test_conflicting_zone_excluded_after_selection(self):
+    def test_conflicting_zone_excluded_after_selection(self, rng):
         """When a cluster is selected, clusters with conflicting zones are excluded."""
         margit = make_cluster(
             "margit",
@@ -1895,9 +1996,7 @@ class TestZoneConflicts:
         _mark_cluster_used(margit, used_zones, pool)
 
         # Now morgott should be excluded (its zone is in used_zones)
-        result = pick_cluster_uniform(
-            pool.get_by_type("major_boss"), used_zones, random.Random(42)
-        )
+        result = pick_cluster_uniform(pool.get_by_type("major_boss"), used_zones, rng)
         assert result is not None
         assert result.id == "other"
 
@@ -1943,23 +2042,24 @@ class TestPickClusterWeightMatched:
             for i, w in enumerate(weights)
         ]
 
-    def test_exact_match_preferred(self):
+    def test_exact_match_preferred(self, rng):
         """When an exact weight match exists, it is chosen."""
         candidates = self._make_pool([1, 2, 3, 4, 5])
         # Run many times: anchor=3 should always pick weight-3 first
         results = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=3,
             )
             assert r is not None
             results.add(r.weight)
         assert results == {3}  # Only exact match since only 1 candidate at w=3
 
-    def test_tolerance_widening_prefers_closer(self):
+    def test_tolerance_widening_prefers_closer(self, rng):
         """Closer weight matches are preferred over further ones."""
         # Weights [2, 5]: anchor=3
         # tol=1: weight 2 matches (|2-3|=1), weight 5 doesn't (|5-3|=2)
@@ -1967,10 +2067,11 @@ class TestPickClusterWeightMatched:
         candidates = self._make_pool([2, 5])
         results = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=3,
                 anchor_tolerance=3,
             )
@@ -1978,7 +2079,7 @@ class TestPickClusterWeightMatched:
             results.add(r.weight)
         assert results == {2}  # Weight 2 always wins (closer to anchor)
 
-    def test_tolerance_widening_same_distance(self):
+    def test_tolerance_widening_same_distance(self, rng):
         """Candidates at the same distance from anchor are both reachable."""
         # Weights [1, 5]: anchor=3, both at distance 2
         # tol=0: no match, tol=1: no match
@@ -1986,10 +2087,11 @@ class TestPickClusterWeightMatched:
         candidates = self._make_pool([1, 5])
         results = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=3,
                 anchor_tolerance=2,
             )
@@ -1997,7 +2099,7 @@ class TestPickClusterWeightMatched:
             results.add(r.weight)
         assert results == {1, 5}  # Both reachable at tol=2
 
-    def test_fallback_uniform_within_window_when_no_anchor_match(self):
+    def test_fallback_uniform_within_window_when_no_anchor_match(self, rng):
         """Outside anchor_tolerance, all in-window candidates are reachable.
 
         Without layer_bounds, the entire pool is "in-window", so the
@@ -2008,10 +2110,11 @@ class TestPickClusterWeightMatched:
         candidates = self._make_pool([1, 5, 7])
         results: set[int] = set()
         for seed in range(100):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=10,
                 anchor_tolerance=2,
             )
@@ -2019,7 +2122,7 @@ class TestPickClusterWeightMatched:
             results.add(r.weight)
         assert results == {1, 5, 7}
 
-    def test_half_step_tolerance(self):
+    def test_half_step_tolerance(self, rng):
         """Half-integer anchors match candidates within 0.5 before widening."""
         # Anchor=3.5, candidates [3.0, 5.0]:
         #   tol=0.0 -> no match, tol=0.5 -> weight 3.0 matches (delta 0.5)
@@ -2030,10 +2133,11 @@ class TestPickClusterWeightMatched:
         ]
         results = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=3.5,
                 anchor_tolerance=2.0,
             )
@@ -2041,15 +2145,16 @@ class TestPickClusterWeightMatched:
             results.add(r.weight)
         assert results == {3.0}
 
-    def test_disabled_when_zero(self):
+    def test_disabled_when_zero(self, rng):
         """anchor_tolerance=0 returns uniform random (no weight preference)."""
         candidates = self._make_pool([1, 5, 10])
         weights_seen: set[int] = set()
         for seed in range(100):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=5,
                 anchor_tolerance=0,
             )
@@ -2058,7 +2163,7 @@ class TestPickClusterWeightMatched:
         # With 100 seeds and 3 candidates, all weights should appear
         assert weights_seen == {1, 5, 10}
 
-    def test_filter_fn_composed(self):
+    def test_filter_fn_composed(self, rng):
         """filter_fn is applied alongside weight matching."""
         c_passant = make_cluster(
             "ok",
@@ -2078,43 +2183,43 @@ class TestPickClusterWeightMatched:
         result = pick_cluster_weight_matched(
             candidates,
             set(),
-            random.Random(42),
+            rng,
             anchor_weight=3,
             filter_fn=can_be_passant_node,
         )
         assert result is not None
         assert result.id == "ok"
 
-    def test_zone_exclusion(self):
+    def test_zone_exclusion(self, rng):
         """Candidates with overlapping zones are excluded."""
         candidates = self._make_pool([3, 3, 3])
         used = {"z0", "z1"}  # Exclude first two
         result = pick_cluster_weight_matched(
             candidates,
             used,
-            random.Random(42),
+            rng,
             anchor_weight=3,
         )
         assert result is not None
         assert result.id == "c2"
 
-    def test_returns_none_when_empty(self):
+    def test_returns_none_when_empty(self, rng):
         """Returns None when no candidates available."""
         result = pick_cluster_weight_matched(
             [],
             set(),
-            random.Random(42),
+            rng,
             anchor_weight=3,
         )
         assert result is None
 
-    def test_reserved_zones_excluded(self):
+    def test_reserved_zones_excluded(self, rng):
         """Reserved zones are excluded like used zones."""
         candidates = self._make_pool([3])
         result = pick_cluster_weight_matched(
             candidates,
             set(),
-            random.Random(42),
+            rng,
             anchor_weight=3,
             reserved_zones=frozenset({"z0"}),
         )
@@ -2124,7 +2229,7 @@ class TestPickClusterWeightMatched:
 class TestPickClusterWeightMatchedRequiredZones:
     """Tests for required_zones parameter in pick_cluster_weight_matched."""
 
-    def test_required_cluster_chosen_even_when_weight_far_from_anchor(self):
+    def test_required_cluster_chosen_even_when_weight_far_from_anchor(self, rng):
         """A required candidate overrides weight matching."""
         c_light_1 = make_cluster("c1", zones=["z1"], weight=5)
         c_light_2 = make_cluster("c2", zones=["z2"], weight=5)
@@ -2132,50 +2237,54 @@ class TestPickClusterWeightMatchedRequiredZones:
         # Anchor is 5 (matches the light clusters). Without required_zones,
         # the heavy one is far from anchor and would not be picked.
         for seed in range(50):
+            rng.seed(seed)
             result = pick_cluster_weight_matched(
                 [c_light_1, c_light_2, c_heavy_required],
                 used_zones=set(),
-                rng=random.Random(seed),
+                rng=rng,
                 anchor_weight=5.0,
                 required_zones=frozenset({"z_required"}),
             )
             assert result is c_heavy_required
 
-    def test_no_required_match_falls_back_to_weight_matching(self):
+    def test_no_required_match_falls_back_to_weight_matching(self, rng):
         """No candidate has a required zone -> standard weight matching."""
         c1 = make_cluster("c1", zones=["z1"], weight=5)
         c2 = make_cluster("c2", zones=["z2"], weight=25)
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 [c1, c2],
                 used_zones=set(),
-                rng=random.Random(seed),
+                rng=rng,
                 anchor_weight=5.0,
                 required_zones=frozenset({"z_unmatched"}),
             )
             # Anchor=5, tolerance defaults to 3.0 -> c1 selected every time.
             assert r is c1
 
-    def test_default_required_zones_is_empty(self):
+    def test_default_required_zones_is_empty(self, rng):
         """Absent required_zones keyword: behavior unchanged."""
         c1 = make_cluster("c1", zones=["z1"], weight=5)
         c2 = make_cluster("c2", zones=["z2"], weight=25)
         r = pick_cluster_weight_matched(
             [c1, c2],
             used_zones=set(),
-            rng=random.Random(0),
+            rng=rng,
             anchor_weight=5.0,
         )
         assert r is c1
 
-    def test_required_zone_excluded_by_reserved_falls_back_to_weight_matching(self):
+    def test_required_zone_excluded_by_reserved_falls_back_to_weight_matching(
+        self, rng
+    ):
         """If the only required candidate is reserved, weight matching applies normally."""
         c_req = make_cluster("c_req", zones=["z_required"], weight=25)
         c_other = make_cluster("c_other", zones=["z_other"], weight=5)
         r = pick_cluster_weight_matched(
             [c_req, c_other],
             used_zones=set(),
-            rng=random.Random(42),
+            rng=rng,
             anchor_weight=5.0,
             reserved_zones=frozenset({"z_required"}),
             required_zones=frozenset({"z_required"}),
@@ -2183,17 +2292,18 @@ class TestPickClusterWeightMatchedRequiredZones:
         # c_req is reserved -> excluded; preferred is empty -> weight matching on c_other only
         assert r is c_other
 
-    def test_multiple_required_candidates_weight_matching_still_applies(self):
+    def test_multiple_required_candidates_weight_matching_still_applies(self, rng):
         """When multiple candidates match required_zones, weight matching still picks the closer one."""
         c_close_required = make_cluster("c_close", zones=["z_req_a"], weight=5)
         c_far_required = make_cluster("c_far", zones=["z_req_b"], weight=25)
         c_non_required = make_cluster("c_nr", zones=["z_other"], weight=5)
         seen = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 [c_close_required, c_far_required, c_non_required],
                 used_zones=set(),
-                rng=random.Random(seed),
+                rng=rng,
                 anchor_weight=5.0,
                 required_zones=frozenset({"z_req_a", "z_req_b"}),
             )
@@ -2258,7 +2368,7 @@ def test_pick_layer_clusters_returns_requested_type_when_available():
     assert all(d == 0.0 for d in deltas[1:])
 
 
-def test_pick_layer_clusters_matches_running_mean_anchor():
+def test_pick_layer_clusters_matches_running_mean_anchor(rng):
     """Subsequent slots are matched against the running mean of prior picks."""
     from speedfog.generator import pick_layer_clusters
 
@@ -2269,7 +2379,7 @@ def test_pick_layer_clusters_matches_running_mean_anchor():
         pool.add(_mk_cluster_v2(f"heavy_{i}", "mini_dungeon", weight=20))
 
     for seed in range(20):
-        rng = random.Random(seed)
+        rng.seed(seed)
         picked, fallbacks, deltas = pick_layer_clusters(
             width=3,
             layer_type="mini_dungeon",
@@ -2285,7 +2395,7 @@ def test_pick_layer_clusters_matches_running_mean_anchor():
             assert deltas[i] == abs(picked[i].weight - anchor)
 
 
-def test_pick_layer_clusters_rejects_out_of_window_candidates():
+def test_pick_layer_clusters_rejects_out_of_window_candidates(rng):
     """A candidate that would blow the layer spread is filtered out.
 
     Pool: 1 cluster at w=5, 3 clusters at w=20. With max_layer_spread=2,
@@ -2301,7 +2411,7 @@ def test_pick_layer_clusters_rejects_out_of_window_candidates():
 
     saw_light_first = False
     for seed in range(50):
-        rng = random.Random(seed)
+        rng.seed(seed)
         try:
             picked, _, _ = pick_layer_clusters(
                 width=3,
@@ -2388,7 +2498,7 @@ def test_pick_layer_clusters_fails_when_no_compatible_remaining():
         )
 
 
-def test_pick_layer_clusters_places_required_zone_first():
+def test_pick_layer_clusters_places_required_zone_first(rng):
     """A cluster covering a required zone is picked before others of the same type."""
     from speedfog.generator import pick_layer_clusters
 
@@ -2398,7 +2508,7 @@ def test_pick_layer_clusters_places_required_zone_first():
     pool.add(_mk_cluster_v2("md_required", "mini_dungeon", weight=10))
 
     for seed in range(50):
-        rng = random.Random(seed)
+        rng.seed(seed)
         picked, fallbacks, _ = pick_layer_clusters(
             width=3,
             layer_type="mini_dungeon",
@@ -2411,7 +2521,7 @@ def test_pick_layer_clusters_places_required_zone_first():
         assert any(c.id == "md_required" for c in picked)
 
 
-def test_pick_layer_clusters_required_zone_consumed_across_slots():
+def test_pick_layer_clusters_required_zone_consumed_across_slots(rng):
     """Once placed in slot N, the zone is no longer prioritized in slot N+1."""
     from speedfog.generator import pick_layer_clusters
 
@@ -2423,7 +2533,7 @@ def test_pick_layer_clusters_required_zone_consumed_across_slots():
         pool.add(_mk_cluster_v2(f"md_filler_{i}", "mini_dungeon", weight=10))
 
     for seed in range(20):
-        rng = random.Random(seed)
+        rng.seed(seed)
         picked, _, _ = pick_layer_clusters(
             width=3,
             layer_type="mini_dungeon",
@@ -2473,30 +2583,32 @@ class TestPickClusterWeightMatchedLayerBounds:
             for i, w in enumerate(weights)
         ]
 
-    def test_rejects_candidate_outside_window_high(self):
+    def test_rejects_candidate_outside_window_high(self, rng):
         """Candidate above layer_max by more than max_layer_spread is rejected."""
         # layer so far = [w=2], spread budget = 2 => allowed range [0, 4].
         candidates = self._make_pool([5])  # weight 5: 5-2=3 > 2
         for seed in range(20):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=2,
                 layer_bounds=(2.0, 2.0),
                 max_layer_spread=2.0,
             )
             assert r is None, f"seed={seed}: expected None, got {r}"
 
-    def test_rejects_candidate_outside_window_low(self):
+    def test_rejects_candidate_outside_window_low(self, rng):
         """Candidate below layer_min by more than max_layer_spread is rejected."""
         # layer so far = [w=4], spread budget = 2 => allowed range [2, 6].
         candidates = self._make_pool([1])  # 4-1=3 > 2
         for seed in range(20):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=4,
                 layer_bounds=(4.0, 4.0),
                 max_layer_spread=2.0,
@@ -2517,7 +2629,7 @@ class TestPickClusterWeightMatchedLayerBounds:
         assert r is not None
         assert r.weight == 4
 
-    def test_running_bounds_tighten_window(self):
+    def test_running_bounds_tighten_window(self, rng):
         """Once layer has min=1, max=2, only candidates with weight in [0, 3] fit."""
         candidates = self._make_pool([0.5, 3.0, 4.0])
         # 4.0 must be rejected (4-1=3); 0.5 and 3.0 must be acceptable.
@@ -2525,10 +2637,11 @@ class TestPickClusterWeightMatchedLayerBounds:
         # candidates are equally reachable.
         accepted_weights: set[float] = set()
         for seed in range(50):
+            rng.seed(seed)
             r = pick_cluster_weight_matched(
                 candidates,
                 set(),
-                random.Random(seed),
+                rng,
                 anchor_weight=1.5,
                 layer_bounds=(1.0, 2.0),
                 max_layer_spread=2.0,
@@ -2553,7 +2666,7 @@ class TestPickClusterWeightMatchedLayerBounds:
         assert r is not None  # Both candidates allowed (no window)
 
 
-def test_pick_layer_clusters_enforces_max_layer_spread():
+def test_pick_layer_clusters_enforces_max_layer_spread(rng):
     """Across many seeds, no layer ever has weight spread > max_layer_spread."""
     from speedfog.generator import pick_layer_clusters
 
@@ -2567,7 +2680,7 @@ def test_pick_layer_clusters_enforces_max_layer_spread():
         pool.add(_mk_cluster_v2(f"heavy_{i}", "mini_dungeon", weight=5))
 
     for seed in range(200):
-        rng = random.Random(seed)
+        rng.seed(seed)
         picked, _fallbacks, _deltas = pick_layer_clusters(
             width=3,
             layer_type="mini_dungeon",
@@ -2679,7 +2792,7 @@ def test_generate_dag_v2_produces_exact_layers_count():
 # Tests migrated from test_route_exits.py
 # ---------------------------------------------------------------------------
 
-from speedfog.dag import Dag, DagNode, FogRef  # noqa: E402
+from speedfog.dag import DagNode, FogRef  # noqa: E402
 
 
 def _mk_cluster_re(
@@ -2865,7 +2978,7 @@ def test_connect_nodes_returns_false_when_source_has_no_free_exit():
     assert len(dag.edges) == 1  # no new edge added
 
 
-def test_connect_nodes_prefers_main_tagged_entry_on_target():
+def test_connect_nodes_prefers_main_tagged_entry_on_target(rng):
     """Boss arenas with multiple gates tag the canonical entry with main:true.
 
     FogMod's getMainSpawnPoint() requires that gate's entrance edge to be
@@ -2897,10 +3010,11 @@ def test_connect_nodes_prefers_main_tagged_entry_on_target():
 
     # Repeat with several rng seeds to confirm main is always picked when present.
     for seed in range(20):
+        rng.seed(seed)
         dag = Dag(seed=0)
         dag.add_node(src)
         dag.add_node(tgt)
-        ok = connect_nodes(dag, src, tgt, random.Random(seed))
+        ok = connect_nodes(dag, src, tgt, rng)
         assert ok is True
         assert (
             dag.edges[0].entry_fog.fog_id == "main_gate"
@@ -3359,6 +3473,11 @@ def test_generate_with_retry_places_multiple_required_zones_without_retry():
         assert zone in placed, f"zone {zone!r} missing from log placements"
 
 
+def _dag_zones(dag: Dag) -> set[str]:
+    """Every zone placed in the DAG, across all node clusters."""
+    return {z for n in dag.nodes.values() for z in n.cluster.zones}
+
+
 class TestExcludeZonesGeneration:
     """End-to-end: a reachable zone, once excluded, never appears in the DAG.
 
@@ -3374,13 +3493,11 @@ class TestExcludeZonesGeneration:
         dag, _log = generate_dag(
             _make_test_config(seed=seed), pool, boss_candidates=_boss_candidates(pool)
         )
-        return {z for n in dag.nodes.values() for z in n.cluster.zones}
+        return _dag_zones(dag)
 
     def test_excluded_reachable_zone_never_appears(self):
         # Control: collect the zones the generator places per seed (no exclusion).
-        baseline = {
-            seed: self._zones_for(make_cluster_pool(), seed) for seed in self._SEEDS
-        }
+        baseline = {seed: _dag_zones(_cached_default_dag(seed)) for seed in self._SEEDS}
         placed_minis = sorted(
             {z for zones in baseline.values() for z in zones if z.startswith("mini_")}
         )
@@ -3391,11 +3508,12 @@ class TestExcludeZonesGeneration:
 
         # Treatment: with target excluded, it must vanish from EVERY seed,
         # including the control seeds where it appeared in the baseline.
+        # Generation only reads the pool, so one filtered pool serves all seeds.
+        pool = make_cluster_pool()
+        removed = pool.exclude_zones([target])
+        assert removed, f"exclude_zones removed nothing for {target!r}"
         for seed in self._SEEDS:
-            pool = make_cluster_pool()
-            removed = pool.exclude_zones([target])
-            assert removed, f"exclude_zones removed nothing for {target!r}"
-            assert target not in self._zones_for(pool, seed)
+            assert target not in self._zones_for(pool, seed), f"seed={seed}"
 
     def test_excluded_explicit_final_boss_is_pruned_then_generates(self):
         """Excluding an explicit final_boss candidate prunes it (no crash).
@@ -3420,7 +3538,7 @@ class TestExcludeZonesGeneration:
             return cfg
 
         # Pre-filter validation passes (another candidate survives).
-        assert validate_exclusions(fresh_config(), make_cluster_pool()) == []
+        assert validate_exclusions(fresh_config(), _read_only_pool()) == []
 
         # Load-bearing check: filtering the cluster but leaving the stale
         # candidate makes validate_config reject it.
@@ -3439,8 +3557,7 @@ class TestExcludeZonesGeneration:
         cfg = fresh_config()
         _apply_exclusions(cfg, pool)
         result = generate_with_retry(cfg, pool, boss_candidates=_boss_candidates(pool))
-        zones = {z for n in result.dag.nodes.values() for z in n.cluster.zones}
-        assert excluded not in zones
+        assert excluded not in _dag_zones(result.dag)
         end_node = result.dag.nodes[result.dag.end_id]
         assert "test_final_boss_zone" in end_node.cluster.zones
 
@@ -0,0 +1,42 @@
+"""Tests for the package-level lazy exports in speedfog/__init__.py."""
+
+import subprocess
+import sys
+
+import pytest
+
+import speedfog
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter so sys.modules starts empty."""
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False
+    )
+
+
+def test_import_does_not_load_submodules():
+    """Importing speedfog defers every export module until first access."""
+    code = (
+        "import sys, speedfog\n"
+        "loaded = sorted(set(speedfog._LAZY_EXPORTS.values()) & set(sys.modules))\n"
+        "assert not loaded, loaded\n"
+        "speedfog.Dag\n"
+        "assert 'speedfog.dag' in sys.modules\n"
+        "assert 'speedfog.generator' not in sys.modules\n"
+    )
+    result = _run_python(code)
+    assert result.returncode == 0, result.stderr
+
+
+def test_exports_resolve_to_defining_module():
+    """Every name in speedfog.__all__ resolves to its defining module."""
+    for name in speedfog.__all__:
+        value = getattr(speedfog, name)
+        assert value.__module__ == speedfog._LAZY_EXPORTS[name]
+
+
+def test_unknown_attribute_raises():
+    """Names outside the export table raise AttributeError."""
+    with pytest.raises(AttributeError):
+        speedfog.not_exported  # noqa: B018
@@ -18,12 +18,13 @@ from speedfog import (
 from speedfog.graph_export import export_json
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def real_clusters_and_bosses():
     """Load clusters.json, snapshot boss candidates, then filter.
 
     Returns (clusters, boss_candidates) where boss_candidates is captured
-    BEFORE filter_passant_incompatible() removes dead-end arenas.
+    BEFORE filter_passant_incompatible() removes dead-end arenas. Parsed
+    once per session: tests only read the pool.
     """
     clusters_path = Path(__file__).parent.parent / "data" / "clusters.json"
     if not clusters_path.exists():
@@ -38,13 +39,13 @@ def real_clusters_and_bosses():
     return clusters, boss_candidates
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def real_clusters(real_clusters_and_bosses):
     """Load the actual clusters.json with standard preprocessing."""
     return real_clusters_and_bosses[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def real_boss_candidates(real_clusters_and_bosses):
     """Boss candidates snapshotted before passant filtering."""
     return real_clusters_and_bosses[1]
@@ -330,6 +330,17 @@ class TestExportSpoilerLog:
         # Should have weight annotations
         assert "(w:" in content
 
+    def test_include_graph_false_skips_ascii_graph(self, tmp_path: Path):
+        """include_graph=False omits the ASCII graph but keeps node details."""
+        dag = make_test_dag()
+        output_file = tmp_path / "spoiler.txt"
+
+        export_spoiler_log(dag, output_file, include_graph=False)
+
+        content = output_file.read_text(encoding="utf-8")
+        assert "(w:" not in content
+        assert "NODE DETAILS" in content
+
     def test_contains_node_details_section(self, tmp_path: Path):
         """export_spoiler_log output contains node details section."""
         dag = make_test_dag()
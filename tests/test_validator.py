@@ -2,10 +2,29 @@
 
 from speedfog.clusters import ClusterData, ClusterPool
 from speedfog.config import Config
-from speedfog.dag import Dag, DagNode, FogRef
+from speedfog.dag import Dag, DagNode, FogRef, fog_ref
 from speedfog.validator import ValidationResult, validate_dag, validate_exclusions
 
 
+def _link(
+    dag: Dag,
+    source_id: str,
+    target_id: str,
+    exit_fog_id: str,
+    entry_fog_id: str | None = None,
+) -> None:
+    """Add an edge whose fogs are zoned in each endpoint's cluster.
+
+    entry_fog_id defaults to exit_fog_id (the same gate seen from both sides).
+    """
+    dag.add_edge(
+        source_id,
+        target_id,
+        fog_ref(exit_fog_id, dag.nodes[source_id].cluster.zones[0]),
+        fog_ref(entry_fog_id or exit_fog_id, dag.nodes[target_id].cluster.zones[0]),
+    )
+
+
 def make_cluster(
     cluster_id: str,
     zones: list[str] | None = None,
@@ -49,7 +68,7 @@ def make_simple_dag(seed: int = 42) -> Dag:
             exit_fogs=[],
         )
     )
-    dag.add_edge("start", "end", "fog_1", "fog_1")
+    _link(dag, "start", "end", "fog_1")
     dag.start_id = "start"
     dag.end_id = "end"
     return dag
@@ -108,7 +127,7 @@ def make_dag_with_content(
                 exit_fogs=[f"fog_{edge_idx + 1}"],
             )
         )
-        dag.add_edge(prev_id, node_id, f"fog_{edge_idx}", f"fog_{edge_idx}")
+        _link(dag, prev_id, node_id, f"fog_{edge_idx}")
         prev_id = node_id
         edge_idx += 1
 
@@ -130,7 +149,7 @@ def make_dag_with_content(
                 exit_fogs=[f"fog_{edge_idx + 1}"],
             )
         )
-        dag.add_edge(prev_id, node_id, f"fog_{edge_idx}", f"fog_{edge_idx}")
+        _link(dag, prev_id, node_id, f"fog_{edge_idx}")
         prev_id = node_id
         edge_idx += 1
 
@@ -152,7 +171,7 @@ def make_dag_with_content(
                 exit_fogs=[f"fog_{edge_idx + 1}"],
             )
         )
-        dag.add_edge(prev_id, node_id, f"fog_{edge_idx}", f"fog_{edge_idx}")
+        _link(dag, prev_id, node_id, f"fog_{edge_idx}")
         prev_id = node_id
         edge_idx += 1
 
@@ -174,7 +193,7 @@ def make_dag_with_content(
                 exit_fogs=[f"fog_{edge_idx + 1}"],
             )
         )
-        dag.add_edge(prev_id, node_id, f"fog_{edge_idx}", f"fog_{edge_idx}")
+        _link(dag, prev_id, node_id, f"fog_{edge_idx}")
         prev_id = node_id
         edge_idx += 1
 
@@ -190,7 +209,7 @@ def make_dag_with_content(
             exit_fogs=[],
         )
     )
-    dag.add_edge(prev_id, "end", f"fog_{edge_idx}", f"fog_{edge_idx}")
+    _link(dag, prev_id, "end", f"fog_{edge_idx}")
     dag.start_id = "start"
     dag.end_id = "end"
 
@@ -396,7 +415,7 @@ class TestSharedEntranceValidation:
                 exit_fogs=["fog_a_out"],
             )
         )
-        dag.add_edge("start", "branch_a", "exit_a", "fog_a")
+        _link(dag, "start", "branch_a", "exit_a", "fog_a")
 
         branch_b = make_cluster("branch_b", cluster_type="mini_dungeon")
         dag.add_node(
@@ -409,7 +428,7 @@ class TestSharedEntranceValidation:
                 exit_fogs=["fog_b_out"],
             )
         )
-        dag.add_edge("start", "branch_b", "exit_b", "fog_b")
+        _link(dag, "start", "branch_b", "exit_b", "fog_b")
 
         # Shared entrance merge: 2 incoming edges, 1 entry_fog
         merge_cluster = make_cluster(
@@ -426,8 +445,8 @@ class TestSharedEntranceValidation:
                 exit_fogs=["merge_exit"],
             )
         )
-        dag.add_edge("branch_a", "merge", "fog_a_out", "shared_entry")
-        dag.add_edge("branch_b", "merge", "fog_b_out", "shared_entry")
+        _link(dag, "branch_a", "merge", "fog_a_out", "shared_entry")
+        _link(dag, "branch_b", "merge", "fog_b_out", "shared_entry")
 
         # End node
         end_cluster = make_cluster("end", cluster_type="major_boss", weight=0)
@@ -441,7 +460,7 @@ class TestSharedEntranceValidation:
                 exit_fogs=[],
             )
         )
-        dag.add_edge("merge", "end", "merge_exit", "end_entry")
+        _link(dag, "merge", "end", "merge_exit", "end_entry")
         dag.start_id = "start"
         dag.end_id = "end"
 
@@ -480,7 +499,7 @@ class TestSharedEntranceValidation:
                 exit_fogs=["bad_exit"],
             )
         )
-        dag.add_edge("start", "bad", "exit_a", "fog_a")
+        _link(dag, "start", "bad", "exit_a", "fog_a")
 
         end_cluster = make_cluster("end", cluster_type="major_boss", weight=0)
         dag.add_node(
@@ -493,7 +512,7 @@ class TestSharedEntranceValidation:
                 exit_fogs=[],
             )
         )
-        dag.add_edge("bad", "end", "bad_exit", "end_entry")
+        _link(dag, "bad", "end", "bad_exit", "end_entry")
         dag.start_id = "start"
         dag.end_id = "end"
 
@@ -731,8 +750,8 @@ class TestLayerTypeHomogeneity:
                 exit_fogs=["fog_b_out"],
             )
         )
-        dag.add_edge("start", "node_a", "exit_a", "fog_a")
-        dag.add_edge("start", "node_b", "exit_b", "fog_b")
+        _link(dag, "start", "node_a", "exit_a", "fog_a")
+        _link(dag, "start", "node_b", "exit_b", "fog_b")
 
         end_cluster = make_cluster("end_c", cluster_type="final_boss")
         dag.add_node(
@@ -745,8 +764,8 @@ class TestLayerTypeHomogeneity:
                 exit_fogs=[],
             )
         )
-        dag.add_edge("node_a", "end", "fog_a_out", "fog_end")
-        dag.add_edge("node_b", "end", "fog_b_out", "fog_end")
+        _link(dag, "node_a", "end", "fog_a_out", "fog_end")
+        _link(dag, "node_b", "end", "fog_b_out", "fog_end")
         dag.start_id = "start"
         dag.end_id = "end"
 
@@ -792,8 +811,8 @@ class TestLayerTypeHomogeneity:
                 exit_fogs=["fog_b_out"],
             )
         )
-        dag.add_edge("start", "node_a", "exit_a", "fog_a")
-        dag.add_edge("start", "node_b", "exit_b", "fog_b")
+        _link(dag, "start", "node_a", "exit_a", "fog_a")
+        _link(dag, "start", "node_b", "exit_b", "fog_b")
 
         # Merge to end
         end_cluster = make_cluster("end_c", cluster_type="final_boss")
@@ -807,8 +826,8 @@ class TestLayerTypeHomogeneity:
                 exit_fogs=[],
             )
         )
-        dag.add_edge("node_a", "end", "fog_a_out", "fog_end")
-        dag.add_edge("node_b", "end", "fog_b_out", "fog_end")
+        _link(dag, "node_a", "end", "fog_a_out", "fog_end")
+        _link(dag, "node_b", "end", "fog_b_out", "fog_end")
         dag.start_id = "start"
         dag.end_id = "end"
 
@@ -1069,7 +1088,7 @@ class TestLayerWeightSpread:
                     exit_fogs=[f"out_{i}"],
                 )
             )
-            dag.add_edge("start", f"n{i}", f"exit_{i}", f"in_{i}")
+            _link(dag, "start", f"n{i}", f"exit_{i}", f"in_{i}")
         dag.add_node(
             DagNode(
                 id="end",
@@ -1081,7 +1100,7 @@ class TestLayerWeightSpread:
             )
         )
         for i in range(len(weights)):
-            dag.add_edge(f"n{i}", "end", f"out_{i}", f"end_in_{i}")
+            _link(dag, f"n{i}", "end", f"out_{i}", f"end_in_{i}")
         dag.start_id = "start"
         dag.end_id = "end"
         return dag